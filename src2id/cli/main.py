@@ -16,6 +16,13 @@ from rich.console import Console
 from rich.table import Table
 from tabulate import tabulate
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 from src2id import __version__
 from src2id.core.config import SWHPIConfig
 from src2id.core.models import PackageMatch
@@ -225,7 +232,25 @@ def output_json(matches: list[PackageMatch], config: SWHPIConfig) -> None:
         "count": len(matches),
         "threshold": config.report_match_threshold,
     }
-    print(json.dumps(output, indent=2, default=str))
+    
+    if ORJSON_AVAILABLE:
+        # orjson encodes straight to bytes; write them without a str round-trip
+        data = orjson.dumps(
+            output,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+            default=str,
+        )
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is not None:
+            sys.stdout.flush()
+            buffer.write(data)
+            buffer.flush()
+        else:
+            sys.stdout.write(data.decode("utf-8"))
+    else:
+        # Non-ASCII is written as-is, like orjson does, so the output does not
+        # depend on which encoder is installed
+        print(json.dumps(output, indent=2, default=str, ensure_ascii=False))
 
 
 def show_local_source_analysis(path: Path, config: SWHPIConfig) -> None:
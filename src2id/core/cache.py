@@ -2,6 +2,7 @@
 
 import json
 import hashlib
+import os
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
@@ -21,10 +22,10 @@ class PersistentCache:
             ttl_hours: Time-to-live for cache entries in hours
         """
         if cache_dir is None:
-            # Use user's cache directory
-            cache_dir = Path.home() / '.cache' / 'swhpi'
+            # Use SRC2PURL_CACHE_DIR if set, otherwise the user's cache directory
+            cache_dir = os.environ.get('SRC2PURL_CACHE_DIR') or Path.home() / '.cache' / 'swhpi'
         
-        self.cache_dir = Path(cache_dir)
+        self.cache_dir = Path(cache_dir).expanduser()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.ttl = timedelta(hours=ttl_hours)
         
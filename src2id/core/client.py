@@ -15,6 +15,13 @@ except ImportError:
     SWH_CLIENT_AVAILABLE = False
     WebAPIClient = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 from src2id.core.cache import PersistentCache
 from src2id.core.config import SWHPIConfig
 from src2id.core.models import MatchType, SHAPIResponse, SHOriginMatch
@@ -24,6 +31,9 @@ from src2id.utils.datetime_utils import parse_datetime
 class SoftwareHeritageClient:
     """Handles all interactions with Software Heritage API."""
     
+    # Maximum number of SWHIDs accepted by the /known/ endpoint per request
+    KNOWN_BATCH_SIZE = 1000
+    
     def __init__(self, config: SWHPIConfig):
         """
         Initialize the Software Heritage client.
@@ -80,7 +90,18 @@ class SoftwareHeritageClient:
             headers = {}
             if self.config.api_token:
                 headers["Authorization"] = f"Bearer {self.config.api_token}"
-            self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
+            # One pooled connector per client so every request reuses
+            # keep-alive connections and cached DNS lookups
+            connector = aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+            )
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                headers=headers,
+                connector=connector,
+            )
     
     async def close_session(self):
         """Close the aiohttp session."""
@@ -119,6 +140,51 @@ class SoftwareHeritageClient:
         if not swhids:
             return {}
         
+        # Serve known status from the cache where possible; definitive negative
+        # results are cached too so absent SWHIDs are not queried again
+        results = {}
+        missing = swhids
+        if self.cache is not None:
+            missing = []
+            for swhid in swhids:
+                cached = self.cache.get(f"known:{swhid}")
+                if cached is not None:
+                    results[swhid] = bool(cached.data)
+                else:
+                    missing.append(swhid)
+            
+            if self.config.verbose and results:
+                print(f"Cache hit for {len(results)}/{len(swhids)} SWHIDs")
+            
+            if not missing:
+                return results
+        
+        fetched = await self._fetch_swhids_known(missing)
+        
+        # A failed request says nothing about the archive: report the SWHID as
+        # unknown for now, but do not cache it so the next check asks again
+        if self.cache is not None:
+            for swhid, known in fetched.items():
+                if known is not None:
+                    self.cache.set(
+                        f"known:{swhid}",
+                        SHAPIResponse(data=known, headers={}, status=200)
+                    )
+        
+        results.update((swhid, bool(known)) for swhid, known in fetched.items())
+        return results
+    
+    async def _fetch_swhids_known(self, swhids: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Query the archive for the known status of SWHIDs, bypassing the cache.
+        
+        Args:
+            swhids: List of Software Heritage Identifiers
+            
+        Returns:
+            Dictionary mapping SWHID to known status, or to None when the
+            status could not be determined because a request failed
+        """
         # Use official client if available
         if self._use_official_client and self.web_client:
             try:
@@ -134,19 +200,96 @@ class SoftwareHeritageClient:
         if not self.session:
             await self.start_session()
         
-        # Fallback to individual requests
-        results = {}
-        if self.config.verbose:
-            print(f"Using fallback individual requests for {len(swhids)} SWHIDs")
+        # Query the /known/ endpoint in batches; batches run concurrently,
+        # bounded by the rate limiter semaphore
+        batches = [
+            swhids[i:i + self.KNOWN_BATCH_SIZE]
+            for i in range(0, len(swhids), self.KNOWN_BATCH_SIZE)
+        ]
+        batch_results = await asyncio.gather(
+            *(self._post_known_batch(batch) for batch in batches)
+        )
         
-        for i, swhid in enumerate(swhids):
-            if self.config.verbose and len(swhids) > 5:
-                print(f"Checking SWHID {i+1}/{len(swhids)}: {swhid[:20]}...")
-            dir_info = await self._get_directory_info(swhid)
-            results[swhid] = dir_info is not None
+        results = {}
+        for batch, batch_result in zip(batches, batch_results):
+            if batch_result is not None:
+                results.update(batch_result)
+                continue
+            
+            # Fallback to individual requests
+            if self.config.verbose:
+                print(f"Using fallback individual requests for {len(batch)} SWHIDs")
+            
+            for i, swhid in enumerate(batch):
+                if self.config.verbose and len(batch) > 5:
+                    print(f"Checking SWHID {i+1}/{len(batch)}: {swhid[:20]}...")
+                results[swhid] = await self._is_directory_known(swhid)
         
         return results
     
+    async def _post_known_batch(self, swhids: List[str]) -> Optional[Dict[str, bool]]:
+        """
+        Check a batch of SWHIDs with a single request to the /known/ endpoint.
+        
+        Args:
+            swhids: Up to KNOWN_BATCH_SIZE SWHIDs
+            
+        Returns:
+            Dictionary mapping SWHID to known status, or None if the request failed
+        """
+        await self._handle_rate_limiting()
+        
+        url = f"{self.config.sh_api_base}/known/"
+        
+        # Encode the body once up front instead of on every attempt
+        body = self._encode_json(swhids)
+        headers = {"Content-Type": "application/json"}
+        
+        for retry in range(self.config.max_retries):
+            try:
+                async with self._rate_limiter:
+                    timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
+                    async with self.session.post(
+                        url, data=body, headers=headers, timeout=timeout
+                    ) as response:
+                        if response.status == 200:
+                            data = await response.json()
+                            return {
+                                swhid: bool(data.get(swhid, {}).get('known', False))
+                                for swhid in swhids
+                            }
+                        
+                        elif response.status == 429:  # Rate limited
+                            retry_after = int(response.headers.get('Retry-After', 60))
+                            if self.config.verbose:
+                                print(f"Rate limited. Waiting {retry_after} seconds...")
+                            await asyncio.sleep(retry_after)
+                            continue
+                        
+                        else:
+                            if self.config.verbose:
+                                print(f"HTTP {response.status}: {url}")
+                            return None
+            
+            except asyncio.TimeoutError:
+                if self.config.verbose:
+                    print(f"Request timeout: {url}")
+                return None
+            
+            except ClientError as e:
+                if self.config.verbose:
+                    print(f"Request error (attempt {retry + 1}/{self.config.max_retries}): {e}")
+                if retry < self.config.max_retries - 1:
+                    await asyncio.sleep(2 ** retry)  # Exponential backoff
+                continue
+            
+            except Exception as e:
+                if self.config.verbose:
+                    print(f"Unexpected error: {e}")
+                return None
+        
+        return None
+    
     async def get_directory_origins(self, swhid: str) -> List[SHOriginMatch]:
         """
         Get all origins containing this directory.
@@ -185,7 +328,23 @@ class SoftwareHeritageClient:
         
         return origins
     
-    
+    async def get_origin_for_swhid(self, swhid: str) -> Optional[str]:
+        """
+        Get the URL of the first origin containing a SWHID.
+        
+        Args:
+            swhid: Software Heritage Identifier
+            
+        Returns:
+            Origin URL or None if no origin was found
+        """
+        origins_data = await self._get_directory_origins_data(swhid)
+        
+        for origin in origins_data:
+            if isinstance(origin, dict) and origin.get('url'):
+                return origin['url']
+        
+        return None
     
     async def _get_directory_info(self, swhid: str) -> Optional[Dict[str, Any]]:
         """Get basic directory information."""
@@ -198,6 +357,17 @@ class SoftwareHeritageClient:
         
         return response.data if response else None
     
+    async def _is_directory_known(self, swhid: str) -> Optional[bool]:
+        """Look a SWHID up directly; None if the lookup itself failed."""
+        dir_hash = self._extract_hash_from_swhid(swhid)
+        if not dir_hash:
+            return False
+        
+        response = await self._make_request(f"/directory/{dir_hash}/", allow_404=True)
+        if response is None:
+            return None
+        return response.status != 404
+    
     async def _get_directory_origins_data(self, swhid: str) -> List[Dict[str, Any]]:
         """Get origins data for a directory."""
         # Note: The actual SH API might not have a direct endpoint for this
@@ -248,7 +418,7 @@ class SoftwareHeritageClient:
                     else:
                         print(f"Cache hit for {endpoint}")
                 # Return None for cached 404s with None data
-                if cached.status == 404 and cached.data is None:
+                if cached.status == 404 and cached.data is None and not allow_404:
                     return None
                 return cached
         
@@ -339,6 +509,13 @@ class SoftwareHeritageClient:
         
         return None
     
+    @staticmethod
+    def _encode_json(payload: Any) -> bytes:
+        """Encode a request body as JSON bytes, using orjson when available."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(payload)
+        return json.dumps(payload).encode('utf-8')
+    
     async def _handle_rate_limiting(self):
         """Implement rate limiting with configurable delay."""
         current_time = asyncio.get_event_loop().time()
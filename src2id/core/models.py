@@ -1,6 +1,7 @@
 """Data models for SHPI."""
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -27,6 +28,9 @@ class PackageMatch:
     frequency_count: int = 0
     is_official_org: bool = False
     purl: Optional[str] = None
+    author: Optional[str] = None
+    homepage: Optional[str] = None
+    repository_url: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary for JSON output."""
@@ -41,6 +45,9 @@ class PackageMatch:
             "frequency_count": self.frequency_count,
             "is_official_org": self.is_official_org,
             "purl": self.purl,
+            "author": self.author,
+            "homepage": self.homepage,
+            "repository_url": self.repository_url,
         }
 
 
@@ -53,6 +60,7 @@ class DirectoryCandidate:
     depth: int
     specificity_score: float
     file_count: int
+    mtime_ns: int = 0
 
 
 @dataclass
@@ -63,6 +71,34 @@ class ContentCandidate:
     swhid: str
     depth: int
     size: int
+    mtime_ns: int = 0
+
+
+@dataclass
+class CandidateBatch:
+    """Column-oriented view of scanner candidates.
+    
+    Keeps SWHIDs, paths, sizes and modification times in parallel sequences
+    so callers can slice a single column (e.g. ``batch.swhids[:10]``) without
+    touching every candidate object. For directories ``sizes`` holds the
+    relevant file count. The numeric columns are typed arrays, so they can be
+    handed to buffer-protocol consumers such as ``memoryview`` without copying.
+    """
+    
+    swhids: List[str] = field(default_factory=list)
+    paths: List[Path] = field(default_factory=list)
+    sizes: array = field(default_factory=lambda: array('Q'))
+    mtimes: array = field(default_factory=lambda: array('q'))
+    
+    def __len__(self) -> int:
+        return len(self.swhids)
+    
+    def append(self, swhid: str, path: Path, size: int, mtime_ns: int = 0) -> None:
+        """Add a single candidate to the batch."""
+        self.swhids.append(swhid)
+        self.paths.append(path)
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
 
 
 @dataclass
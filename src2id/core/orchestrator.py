@@ -1,15 +1,18 @@
 """Main orchestrator for the SH Package Identifier."""
 
 import asyncio
+import heapq
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Tuple
+from urllib.parse import urlparse
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from src2id.core.config import SWHPIConfig
 from src2id.core.models import DirectoryCandidate, ContentCandidate, MatchType, PackageMatch, SHOriginMatch
+from src2id.core.scorer import ConfidenceScorer, MatchRecord
 from src2id.search import SourceIdentifier, create_default_registry
 
 console = Console()
@@ -69,7 +72,6 @@ class SHPackageIdentifier:
     def confidence_scorer(self):
         """Lazy load confidence scorer."""
         if self._confidence_scorer is None:
-            from src2id.core.scorer import ConfidenceScorer
             self._confidence_scorer = ConfidenceScorer(self.config)
         return self._confidence_scorer
     
@@ -164,8 +166,10 @@ class SHPackageIdentifier:
             if self.config.verbose:
                 console.print("[bold blue]Phase 2: Manifest-based validation and enhancement[/bold blue]")
 
-            # Extract package metadata directly using UPMEX
-            manifest_matches = self._extract_with_upmex(path)
+            # Extract package metadata directly using UPMEX. The extraction is
+            # synchronous file parsing, so run it in a worker thread to keep the
+            # event loop free for pending network work.
+            manifest_matches = await asyncio.to_thread(self._extract_with_upmex, path)
 
             # Merge and enhance with manifest data
             enhanced_matches = self._merge_and_enhance_matches(hash_based_matches, manifest_matches, path)
@@ -358,7 +362,6 @@ class SHPackageIdentifier:
 
         # Extract key parts for matching using proper URL parsing
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(url if url.startswith(('http://', 'https://')) else f'https://{url}')
             hostname = parsed.hostname.lower() if parsed.hostname else ''
             path_parts = parsed.path.strip('/').split('/')
@@ -383,7 +386,7 @@ class SHPackageIdentifier:
                 task = progress.add_task("Scanning directories and files...", total=None)
                 
                 # Scan the main path - returns both dirs and files
-                dir_candidates, file_candidates = self.scanner.scan_recursive(path)
+                dir_candidates, file_candidates = await asyncio.to_thread(self.scanner.scan_recursive, path)
                 
                 # Also scan subdirectories for better matching
                 progress.update(task, description="Scanning subdirectories...")
@@ -392,7 +395,7 @@ class SHPackageIdentifier:
                 
                 progress.update(task, completed=True)
         else:
-            dir_candidates, file_candidates = self.scanner.scan_recursive(path)
+            dir_candidates, file_candidates = await asyncio.to_thread(self.scanner.scan_recursive, path)
             subdirs = await self._scan_subdirectories(path)
             dir_candidates.extend(subdirs)
         
@@ -436,12 +439,9 @@ class SHPackageIdentifier:
             subdir = path / dir_name
             if subdir.exists() and subdir.is_dir():
                 try:
-                    from src2id.core.models import DirectoryCandidate
-                    
-                    file_count = sum(1 for _ in subdir.rglob('*') if _.is_file())
-                    if file_count >= 3:  # Low threshold for subdirs
-                        swhid = self.swhid_generator.generate_directory_swhid(subdir)
-                        
+                    # Counting and hashing walk the subtree; keep them off the event loop
+                    file_count, swhid = await asyncio.to_thread(self._hash_subdirectory, subdir)
+                    if swhid is not None:
                         candidate = DirectoryCandidate(
                             path=subdir,
                             swhid=swhid,
@@ -457,6 +457,13 @@ class SHPackageIdentifier:
         
         return candidates
     
+    def _hash_subdirectory(self, subdir: Path) -> Tuple[int, Optional[str]]:
+        """Count a subdirectory's files and hash it if it has enough of them."""
+        file_count = sum(1 for _ in subdir.rglob('*') if _.is_file())
+        if file_count < 3:  # Low threshold for subdirs
+            return file_count, None
+        return file_count, self.swhid_generator.generate_directory_swhid(subdir)
+    
     async def _find_matches(self, dir_candidates: List[DirectoryCandidate], file_candidates: List[ContentCandidate]) -> List[SHOriginMatch]:
         """Find matches in Software Heritage for all candidates (dirs and files)."""
         all_matches = []
@@ -702,9 +709,8 @@ class SHPackageIdentifier:
         if self.config.verbose and origin_matches:
             console.print(f"[green]Found {len(origin_matches)} potential matches via keyword search[/green]")
         
-        # Sort by similarity score (highest first) and return top matches
-        origin_matches.sort(key=lambda x: x.similarity_score, reverse=True)
-        return origin_matches[:10]  # Limit to top 10 matches
+        # Return the top matches by similarity score (highest first)
+        return heapq.nlargest(10, origin_matches, key=lambda x: x.similarity_score)
     
     async def _process_matches(
         self, matches: List[SHOriginMatch]
@@ -712,25 +718,28 @@ class SHPackageIdentifier:
         """Process matches to extract package information."""
         package_matches = []
         
-        for match in matches:
-            # Extract package coordinates
-            coordinates = self.coordinate_extractor.extract_coordinates(match)
-            
-            # Calculate confidence score
-            confidence = self.confidence_scorer.calculate_confidence({
-                'match_type': match.match_type,
-                'similarity_score': getattr(match, 'similarity_score', 1.0),
-                'frequency_rank': match.visit_count,
-                'is_official_org': self.coordinate_extractor.is_official_organization(
+        # Calculate confidence scores, measuring recency against one clock reading
+        confidences = self.confidence_scorer.score_batch([
+            MatchRecord(
+                match_type=match.match_type,
+                similarity_score=getattr(match, 'similarity_score', 1.0),
+                frequency_rank=match.visit_count,
+                is_official_org=self.coordinate_extractor.is_official_organization(
                     match.origin_url
                 ),
-                'last_activity': match.last_seen
-            })
-            
+                last_activity=match.last_seen
+            )
+            for match in matches
+        ])
+        
+        for match, confidence in zip(matches, confidences):
             # Skip low confidence matches
             if confidence < self.config.report_match_threshold:
                 continue
             
+            # Extract package coordinates
+            coordinates = self.coordinate_extractor.extract_coordinates(match)
+            
             # Generate PURL if confidence is high enough
             purl = None
             if confidence >= self.config.purl_generation_threshold:
@@ -774,7 +783,6 @@ class SHPackageIdentifier:
     def _extract_base_repo_url(self, url: str) -> str:
         """Extract base repository URL for deduplication."""
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(url)
             hostname = parsed.hostname.lower() if parsed.hostname else ''
 
@@ -1,9 +1,33 @@
 """Package URL (PURL) generation."""
 
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 from urllib.parse import quote, urlparse
 
+# Download URLs pointing inside a repository rather than at its root
+_INVALID_URL_RE = re.compile(r'/pull/\d+|/issues/\d+|/wiki/|/blob/')
+_GITHUB_RE = re.compile(r'github\.com[:/]([^/]+)/([^/\s]+)')
+_GITLAB_RE = re.compile(r'gitlab\.com[:/]([^/]+)/([^/\s?#]+)')
+
+# Hosts whose PURL is derived from the repository URL
+_REPO_HOST_GENERATORS = {
+    'github.com': '_generate_github_purl',
+    'gitlab.com': '_generate_gitlab_purl',
+}
+
+# Hosts whose PURL is derived from the package name alone
+_REGISTRY_HOST_GENERATORS = {
+    'pypi.org': '_generate_pypi_purl',
+    'npmjs.org': '_generate_npm_purl',
+    'npmjs.com': '_generate_npm_purl',
+    'registry.npmjs.org': '_generate_npm_purl',
+    'crates.io': '_generate_cargo_purl',
+    'rubygems.org': '_generate_gem_purl',
+    'packagist.org': '_generate_composer_purl',
+    'nuget.org': '_generate_nuget_purl',
+}
+
 
 class PURLGenerator:
     """Generates Package URLs following PURL specification."""
@@ -30,6 +54,21 @@ class PURLGenerator:
         if not download_url or not name:
             return None
         
+        # The same coordinates recur across the subdirectories of one repository
+        return _generate_purl_cached(type(self), download_url, name, version)
+    
+    def _build_purl(self, download_url: str, name: str, version: Optional[str]) -> Optional[str]:
+        """
+        Build the PURL for validated coordinates.
+        
+        Args:
+            download_url: Download URL
+            name: Package name
+            version: Package version
+            
+        Returns:
+            PURL string or None if the URL is invalid or unsupported
+        """
         # Validate download URL
         if not self._validate_download_url(download_url):
             return None
@@ -38,28 +77,19 @@ class PURLGenerator:
         try:
             parsed_url = urlparse(download_url)
             hostname = parsed_url.hostname.lower() if parsed_url.hostname else ''
+            if hostname.endswith('.pypi.org'):
+                hostname = 'pypi.org'
 
-            if hostname == 'github.com':
-                return self._generate_github_purl(download_url, name, version)
-            elif hostname == 'gitlab.com':
-                return self._generate_gitlab_purl(download_url, name, version)
-            elif hostname == 'pypi.org' or hostname.endswith('.pypi.org'):
-                return self._generate_pypi_purl(name, version)
-            elif hostname in ('npmjs.org', 'npmjs.com', 'registry.npmjs.org'):
-                return self._generate_npm_purl(name, version)
-            elif hostname == 'crates.io':
-                return self._generate_cargo_purl(name, version)
-            elif hostname == 'rubygems.org':
-                return self._generate_gem_purl(name, version)
-            elif hostname == 'packagist.org':
-                return self._generate_composer_purl(name, version)
-            elif hostname == 'nuget.org':
-                return self._generate_nuget_purl(name, version)
-            elif hostname == 'sourceforge.net' or hostname.endswith('.sourceforge.net'):
-                return self._generate_generic_purl(download_url, name, version)
-            else:
-                # For unknown sources, use generic PURL if possible
-                return self._generate_generic_purl(download_url, name, version)
+            generator = _REPO_HOST_GENERATORS.get(hostname)
+            if generator:
+                return getattr(self, generator)(download_url, name, version)
+            
+            generator = _REGISTRY_HOST_GENERATORS.get(hostname)
+            if generator:
+                return getattr(self, generator)(name, version)
+            
+            # For unknown sources (including SourceForge), use generic PURL if possible
+            return self._generate_generic_purl(download_url, name, version)
         except Exception:
             return self._generate_generic_purl(download_url, name, version)
     
@@ -84,19 +114,8 @@ class PURLGenerator:
         except Exception:
             return False
         
-        # Check for common invalid patterns
-        invalid_patterns = [
-            r'/pull/\d+',  # Pull requests
-            r'/issues/\d+',  # Issues
-            r'/wiki/',  # Wiki pages
-            r'/blob/',  # File browsing (not repo root)
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, url):
-                return False
-        
-        return True
+        # Reject pull requests, issues, wiki pages and file browsing URLs
+        return not _INVALID_URL_RE.search(url)
     
     def _generate_github_purl(self, url: str, name: str, version: Optional[str]) -> Optional[str]:
         """Generate GitHub PURL."""
@@ -200,7 +219,7 @@ class PURLGenerator:
     
     def _extract_github_org_repo(self, url: str) -> Optional[str]:
         """Extract org/repo from GitHub URL."""
-        match = re.search(r'github\.com[:/]([^/]+)/([^/\s]+)', url)
+        match = _GITHUB_RE.search(url)
         if match:
             org = match.group(1)
             repo = match.group(2).rstrip('.git')
@@ -209,7 +228,7 @@ class PURLGenerator:
     
     def _extract_gitlab_org_repo(self, url: str) -> Optional[str]:
         """Extract org/repo from GitLab URL."""
-        match = re.search(r'gitlab\.com[:/]([^/]+)/([^/\s?#]+)', url)
+        match = _GITLAB_RE.search(url)
         if match:
             org = match.group(1)
             repo = match.group(2)
@@ -235,4 +254,12 @@ class PURLGenerator:
         version = version.lstrip('r')
         
         # URL encode special characters
-        return quote(version, safe='.-_')
\ No newline at end of file
+        return quote(version, safe='.-_')
+
+
+@lru_cache(maxsize=4096)
+def _generate_purl_cached(
+    generator_cls: type, download_url: str, name: str, version: Optional[str]
+) -> Optional[str]:
+    """Memoize PURL construction; generators hold no state, so results are per class."""
+    return generator_cls()._build_purl(download_url, name, version)
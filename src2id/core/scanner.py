@@ -1,11 +1,12 @@
 """Directory scanner for generating SWHID candidates."""
 
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Iterator, List, Optional, Set, Tuple, Union
 
 from src2id.core.config import SWHPIConfig
-from src2id.core.models import DirectoryCandidate, ContentCandidate
+from src2id.core.models import CandidateBatch, DirectoryCandidate, ContentCandidate
 
 
 class DirectoryScanner:
@@ -44,22 +45,36 @@ class DirectoryScanner:
         '.yaml', '.yml', '.json', '.xml', '.toml',
     }
     
-    def __init__(self, config: SWHPIConfig, swhid_generator):
+    # SOURCE_EXTENSIONS as a tuple, so str.endswith tests them all in one call
+    _SOURCE_SUFFIXES = tuple(SOURCE_EXTENSIONS)
+    
+    # File extensions never collected as file candidates
+    SKIP_FILE_EXTENSIONS = {'.pyc', '.pyo', '.so', '.dll', '.exe', '.jpg', '.png', '.gif'}
+    
+    # Maximum number of files collected per scan, to avoid overwhelming the API
+    MAX_FILES = 100
+    
+    def __init__(self, config: SWHPIConfig, swhid_generator, max_workers: Optional[int] = None):
         """
         Initialize the directory scanner.
         
         Args:
             config: Configuration settings
             swhid_generator: SWHID generator instance
+            max_workers: Number of threads used to hash candidates
+                (defaults to the ThreadPoolExecutor default)
         """
         self.config = config
         self.swhid_generator = swhid_generator
+        self.max_workers = max_workers
     
     def scan_recursive(self, start_path: Path) -> Tuple[List[DirectoryCandidate], List[ContentCandidate]]:
         """
         Generate directory and file candidates using depth-first approach.
         
         Scans the starting directory and files first, then subdirectories up to max_depth.
+        Rescans walk the tree again; the SWHID generator's per-inode caches
+        keep unchanged files from being read twice.
         
         Args:
             start_path: Starting directory path
@@ -69,63 +84,241 @@ class DirectoryScanner:
         """
         dir_candidates = []
         file_candidates = []
+        
+        for dir_batch, file_batch in self.scan_recursive_iter(start_path):
+            dir_candidates.extend(dir_batch)
+            file_candidates.extend(file_batch)
+        
+        # Sort directory candidates by specificity score (highest first)
+        dir_candidates.sort(key=lambda c: c.specificity_score, reverse=True)
+        
+        if self.config.verbose and file_candidates:
+            print(f"Collected {len(file_candidates)} files for checking")
+        
+        return dir_candidates, file_candidates
+    
+    def scan_recursive_batches(self, start_path: Path) -> Tuple[CandidateBatch, CandidateBatch]:
+        """
+        Generate directory and file candidates as column-oriented batches.
+        
+        Same candidates and ordering as scan_recursive, laid out so a caller
+        that only needs SWHIDs can slice ``batch.swhids`` directly.
+        
+        Args:
+            start_path: Starting directory path
+            
+        Returns:
+            Tuple of (directory batch, file batch)
+        """
+        dir_candidates, file_candidates = self.scan_recursive(start_path)
+        
+        dir_batch = CandidateBatch()
+        for candidate in dir_candidates:
+            dir_batch.append(
+                candidate.swhid, candidate.path, candidate.file_count, candidate.mtime_ns
+            )
+        
+        file_batch = CandidateBatch()
+        for candidate in file_candidates:
+            file_batch.append(
+                candidate.swhid, candidate.path, candidate.size, candidate.mtime_ns
+            )
+        
+        return dir_batch, file_batch
+    
+    def scan_recursive_iter(
+        self,
+        start_path: Path,
+        batch_size: int = 128
+    ) -> Iterator[Tuple[List[DirectoryCandidate], List[ContentCandidate]]]:
+        """
+        Generate directory and file candidates in batches while walking.
+        
+        Candidates are yielded in walk order (not sorted by specificity), so
+        callers that only need a sample can stop before the whole tree is
+        scanned and hashed.
+        
+        Args:
+            start_path: Starting directory path
+            batch_size: Number of candidates per yielded batch
+            
+        Yields:
+            Tuples of (directory candidates, file candidates)
+        """
         current = start_path.resolve()
+        pending = []
+        
+        # Candidate construction hashes file content and, for directories,
+        # walks the whole subtree; run it on a thread pool so file IO and
+        # hashing (which releases the GIL) overlap
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item in self._walk(current, executor):
+                pending.append(item)
+                if len(pending) >= batch_size:
+                    yield self._build_batch(executor, pending, current)
+                    pending = []
+            
+            if pending:
+                yield self._build_batch(executor, pending, current)
+    
+    def _build_batch(
+        self,
+        executor: ThreadPoolExecutor,
+        items: List[Tuple[bool, Path, int, Optional[os.stat_result]]],
+        start_path: Path
+    ) -> Tuple[List[DirectoryCandidate], List[ContentCandidate]]:
+        """Create candidates for a batch of walked paths, preserving walk order."""
+        def create(item: Tuple[bool, Path, int, Optional[os.stat_result]]):
+            is_dir, path, depth, st = item
+            if is_dir:
+                return self._create_candidate(path, depth, start_path, st)
+            return self._create_file_candidate(path, depth, start_path, st)
+        
+        dir_batch = []
+        file_batch = []
+        for (is_dir, _, _, _), candidate in zip(items, executor.map(create, items)):
+            if candidate is None:
+                continue
+            if is_dir:
+                dir_batch.append(candidate)
+            else:
+                file_batch.append(candidate)
         
+        return dir_batch, file_batch
+    
+    def _walk(
+        self,
+        start_path: Path,
+        executor: Optional[ThreadPoolExecutor] = None
+    ) -> Iterator[Tuple[bool, Path, int, Optional[os.stat_result]]]:
+        """
+        Walk the tree and yield the directories and files to turn into candidates.
+        
+        The walk is depth-first and its order does not depend on the executor;
+        when one is given, the listings of a directory's subdirectories are
+        fetched concurrently while the walk descends into the first of them.
+        
+        Args:
+            start_path: Resolved starting directory path
+            executor: Optional thread pool used to prefetch directory listings
+            
+        Yields:
+            Tuples of (is_directory, path, depth, stat); stat is the stat
+            result taken while walking, or None if a directory could not be
+            stat'ed
+        """
         # Track total files scanned (for limiting)
-        max_files = 100  # Reasonable limit to avoid overwhelming the API
         files_scanned = 0
         
-        # Scan subdirectories recursively
-        def scan_directory(path: Path, depth: int):
+        # Directories already walked, by (device, inode) rather than by path
+        # string, so symlink loops and symlinked copies are walked once
+        visited: Set[Tuple[int, int]] = set()
+        
+        # Scan subdirectories recursively. Paths stay plain strings while
+        # walking and only become Path objects for what is yielded.
+        def scan_directory(path: str, depth: int, listing: Optional[Future] = None):
             nonlocal files_scanned
             
             if depth > self.config.max_depth:
                 return
+            
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+            if st is not None:
+                key = (st.st_dev, st.st_ino)
+                if key in visited:
+                    if listing:
+                        listing.cancel()
+                    return
+                visited.add(key)
+            
+            # List the directory once; the entries carry their file type, so
+            # the checks below do not need a stat per child
+            try:
+                entries = listing.result() if listing else self._list_dir(path)
+            except (PermissionError, OSError):
+                if self.config.verbose:
+                    print(f"Permission denied scanning: {path}")
+                return
                 
             # Process current directory
-            if self._is_meaningful_directory(path):
-                self._add_candidate(dir_candidates, path, depth, current)
+            dir_path = Path(path)
+            if self._is_meaningful_directory(dir_path, entries):
+                yield True, dir_path, depth, st
             
             # Process files in current directory (only at depths we're scanning)
-            if files_scanned < max_files:
-                try:
-                    for item in path.iterdir():
-                        if item.is_file() and not item.name.startswith('.'):
+            if files_scanned < self.MAX_FILES:
+                for entry in entries:
+                    try:
+                        # Name checks first: is_file() may need a stat
+                        if not entry.name.startswith('.') and entry.is_file():
                             # Skip very large files and common non-source files
-                            if item.suffix not in {'.pyc', '.pyo', '.so', '.dll', '.exe', '.jpg', '.png', '.gif'}:
-                                if item.stat().st_size < 10_000_000:  # Skip files > 10MB
-                                    self._add_file_candidate(file_candidates, item, depth, current)
+                            if os.path.splitext(entry.name)[1] not in self.SKIP_FILE_EXTENSIONS:
+                                st = entry.stat()
+                                if st.st_size < 10_000_000:  # Skip files > 10MB
+                                    # A symlink's stat describes its target,
+                                    # so it is left for the candidate to take
+                                    if entry.is_symlink():
+                                        st = None
+                                    yield False, Path(entry.path), depth, st
                                     files_scanned += 1
-                                    if files_scanned >= max_files:
+                                    if files_scanned >= self.MAX_FILES:
                                         break
-                except (PermissionError, OSError):
-                    pass
+                    except (PermissionError, OSError):
+                        continue
             
             # Scan subdirectories
             if depth < self.config.max_depth:
-                try:
-                    for subdir in path.iterdir():
-                        if (subdir.is_dir() and 
-                            subdir.name not in self.SKIP_DIRS and 
-                            not subdir.name.startswith('.')):
-                            scan_directory(subdir, depth + 1)
-                except (PermissionError, OSError):
-                    if self.config.verbose:
-                        print(f"Permission denied scanning: {path}")
+                subdirs = [
+                    entry.path for entry in entries
+                    if (entry.name not in self.SKIP_DIRS and
+                        not entry.name.startswith('.') and
+                        self._entry_is_dir(entry))
+                ]
+                listings = [
+                    executor.submit(self._list_dir, subdir) if executor else None
+                    for subdir in subdirs
+                ]
+                for subdir, subdir_listing in zip(subdirs, listings):
+                    yield from scan_directory(subdir, depth + 1, subdir_listing)
         
         # Start scanning from the target directory
-        scan_directory(current, 0)
-        
-        # Sort directory candidates by specificity score (highest first)
-        dir_candidates.sort(key=lambda c: c.specificity_score, reverse=True)
+        yield from scan_directory(os.fspath(start_path), 0)
+    
+    def _list_dir(self, path: Union[str, Path]) -> List[os.DirEntry]:
+        """
+        List the entries of a directory.
         
-        if self.config.verbose and file_candidates:
-            print(f"Collected {len(file_candidates)} files for checking")
+        Every directory listing made while walking goes through here, so
+        listing failures can be simulated per scanner instance.
         
-        return dir_candidates, file_candidates
+        Args:
+            path: Directory path
+            
+        Returns:
+            Directory entries, with the file type cached from the listing
+        """
+        with os.scandir(path) as it:
+            return list(it)
     
-    def _add_candidate(self, candidates: List[DirectoryCandidate], path: Path, depth: int, start_path: Path):
-        """Add a directory candidate to the list."""
+    @staticmethod
+    def _entry_is_dir(entry: os.DirEntry) -> bool:
+        """Return whether a directory entry is a directory, treating errors as no."""
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+    
+    def _create_candidate(
+        self,
+        path: Path,
+        depth: int,
+        start_path: Path,
+        st: Optional[os.stat_result] = None
+    ) -> Optional[DirectoryCandidate]:
+        """Create a directory candidate, or None if it cannot be scanned."""
         try:
             # Generate SWHID for the directory
             swhid = self.swhid_generator.generate_directory_swhid(path)
@@ -143,50 +336,63 @@ class DirectoryScanner:
                 swhid=swhid,
                 depth=depth,
                 specificity_score=specificity_score,
-                file_count=file_count
+                file_count=file_count,
+                mtime_ns=st.st_mtime_ns if st is not None else 0
             )
-            candidates.append(candidate)
             
             if self.config.verbose:
                 print(f"Scanned: {path.relative_to(start_path.parent) if path != start_path else path.name} (depth={depth}, files={file_count})")
                 print(f"  SWHID: {swhid}")
+            
+            return candidate
                 
         except Exception as e:
             if self.config.verbose:
                 print(f"Error scanning {path}: {e}")
+            return None
     
-    def _add_file_candidate(self, candidates: List[ContentCandidate], file_path: Path, depth: int, start_path: Path):
-        """Add a file candidate to the list."""
+    def _create_file_candidate(
+        self,
+        file_path: Path,
+        depth: int,
+        start_path: Path,
+        st: Optional[os.stat_result] = None
+    ) -> Optional[ContentCandidate]:
+        """Create a file candidate, or None if it cannot be scanned."""
         try:
-            # Generate SWHID for the file
-            swhid = self.swhid_generator.generate_content_swhid(file_path)
+            # The SWHID generator reuses the walk's stat instead of stat'ing
+            # again; symlinks come without one and are told apart by it
+            swhid = self.swhid_generator.generate_content_swhid(file_path, st)
+            if st is None:
+                st = os.stat(file_path)
             
-            # Get file size
-            size = file_path.stat().st_size
-            
-            candidate = ContentCandidate(
+            return ContentCandidate(
                 path=file_path,
                 swhid=swhid,
                 depth=depth,
-                size=size
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns
             )
-            candidates.append(candidate)
                 
         except Exception as e:
             if self.config.verbose:
                 print(f"Error scanning file {file_path}: {e}")
+            return None
     
-    def _is_meaningful_directory(self, path: Path) -> bool:
+    def _is_meaningful_directory(
+        self, path: Path, entries: Optional[List[os.DirEntry]] = None
+    ) -> bool:
         """
         Check if directory likely contains package content.
         
         Args:
             path: Directory path to check
+            entries: Entries of ``path`` if the caller already listed it
             
         Returns:
             True if directory should be scanned
         """
-        if not path.is_dir():
+        if entries is None and not path.is_dir():
             return False
         
         # Skip if directory name is in skip list
@@ -200,19 +406,22 @@ class DirectoryScanner:
         # Count source files (including in immediate subdirectories)
         source_file_count = 0
         try:
+            if entries is None:
+                entries = self._list_dir(path)
+            
             # Check files in the directory itself
-            for item in path.iterdir():
-                if item.is_file() and item.suffix in self.SOURCE_EXTENSIONS:
+            for entry in entries:
+                if self._is_source_file(entry):
                     source_file_count += 1
                     if source_file_count >= self.config.min_files:
                         return True
             
             # If not enough files in root, check immediate subdirectories
             if source_file_count < self.config.min_files:
-                for subdir in path.iterdir():
-                    if subdir.is_dir() and subdir.name not in self.SKIP_DIRS:
-                        for item in subdir.iterdir():
-                            if item.is_file() and item.suffix in self.SOURCE_EXTENSIONS:
+                for subdir in entries:
+                    if subdir.name not in self.SKIP_DIRS and self._entry_is_dir(subdir):
+                        for entry in self._list_dir(subdir.path):
+                            if self._is_source_file(entry):
                                 source_file_count += 1
                                 if source_file_count >= self.config.min_files:
                                     return True
@@ -227,6 +436,13 @@ class DirectoryScanner:
         
         return source_file_count >= self.config.min_files
     
+    def _is_source_file(self, entry: os.DirEntry) -> bool:
+        """Return whether a directory entry is a file with a source extension."""
+        return (
+            os.path.splitext(entry.name)[1] in self.SOURCE_EXTENSIONS
+            and entry.is_file()
+        )
+    
     def _count_relevant_files(self, path: Path) -> int:
         """
         Count source files, ignoring build artifacts.
@@ -245,7 +461,7 @@ class DirectoryScanner:
                 
                 # Count source files
                 for file in files:
-                    if any(file.endswith(ext) for ext in self.SOURCE_EXTENSIONS):
+                    if file.endswith(self._SOURCE_SUFFIXES):
                         count += 1
                 
                 # Limit traversal depth for performance
@@ -1,12 +1,34 @@
 """Confidence scoring for package matches."""
 
-from datetime import datetime, timedelta
-from typing import Any, Dict
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from src2id.core.config import SWHPIConfig
 from src2id.utils.datetime_utils import parse_datetime
 
 
+class MatchRecord(NamedTuple):
+    """Scoring inputs for one match, read by attribute rather than by key."""
+    
+    match_type: Any
+    similarity_score: float = 0.5
+    frequency_rank: int = 1
+    is_official_org: bool = False
+    last_activity: Any = None
+    
+    @classmethod
+    def from_dict(cls, match_data: Dict[str, Any]) -> "MatchRecord":
+        """Build a record from a match dictionary, applying the same defaults."""
+        return cls(
+            match_data.get('match_type'),
+            match_data.get('similarity_score', 0.5),
+            match_data.get('frequency_rank', 1),
+            bool(match_data.get('is_official_org', False)),
+            match_data.get('last_activity'),
+        )
+
+
 class ConfidenceScorer:
     """Calculates confidence scores for package matches."""
     
@@ -19,7 +41,11 @@ class ConfidenceScorer:
         """
         self.config = config
     
-    def calculate_confidence(self, match_data: Dict[str, Any]) -> float:
+    def calculate_confidence(
+        self,
+        match_data: Union[MatchRecord, Dict[str, Any]],
+        now: Optional[float] = None
+    ) -> float:
         """
         Multi-factor confidence scoring.
         
@@ -30,35 +56,111 @@ class ConfidenceScorer:
         - Recency of activity
         
         Args:
-            match_data: Dictionary with match information
+            match_data: Match record, or dictionary with match information
+            now: Unix timestamp recency is measured against (defaults to now)
             
         Returns:
             Confidence score between 0 and 1
         """
-        # Get base score from match type
-        base_score = self._get_base_score(match_data)
+        return self._score(self._as_record(match_data), now, self._weights())
+    
+    def score_batch(
+        self, match_data_list: List[Union[MatchRecord, Dict[str, Any]]]
+    ) -> List[float]:
+        """
+        Score several matches against a single clock reading.
         
-        # Calculate individual factor scores
-        frequency_score = self._frequency_score(match_data.get('frequency_rank', 1))
-        authority_score = self._authority_score(match_data.get('is_official_org', False))
-        recency_score = self._recency_score(match_data.get('last_activity'))
+        The clock and the configured weights are read once for the whole
+        batch rather than once per match.
         
-        # Combine scores using configured weights
+        Args:
+            match_data_list: Match records, or dictionaries with match information
+            
+        Returns:
+            Confidence scores, in the order of the input
+        """
+        now = time.time()
+        weights = self._weights()
+        return [
+            self._score(self._as_record(match_data), now, weights)
+            for match_data in match_data_list
+        ]
+    
+    @staticmethod
+    def _as_record(match_data: Union[MatchRecord, Dict[str, Any]]) -> MatchRecord:
+        """Return match data as a MatchRecord, converting dictionaries."""
+        if isinstance(match_data, MatchRecord):
+            return match_data
+        return MatchRecord.from_dict(match_data)
+    
+    def _weights(self) -> Tuple[float, float, float]:
+        """Return the (popularity, authority, recency) weights from the config."""
         weights = self.config.score_weights
+        return (
+            weights.get('popularity', 0.2),
+            weights.get('authority', 0.3),
+            weights.get('recency', 0.3),
+        )
+    
+    def _score(
+        self,
+        record: MatchRecord,
+        now: Optional[float],
+        weights: Tuple[float, float, float]
+    ) -> float:
+        """Score one match with already-resolved clock reading and weights."""
+        # Get base score from match type
+        base_score = self._get_base_score(record)
         
+        # Reduce the match to a hashable key; candidates from the same origin
+        # usually share it, so the combination below is computed once
+        return self._combine_scores(
+            base_score,
+            record.frequency_rank,
+            record.is_official_org,
+            self._days_since(record.last_activity, now),
+            *weights,
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _combine_scores(
+        base_score: float,
+        frequency_rank: int,
+        is_official: bool,
+        days_ago: Optional[int],
+        popularity_weight: float,
+        authority_weight: float,
+        recency_weight: float
+    ) -> float:
+        """
+        Combine the factor scores and multipliers into a bounded confidence.
+        
+        Args:
+            base_score: Score from the match type
+            frequency_rank: Number of visits/occurrences
+            is_official: Whether from official organization
+            days_ago: Days since last activity, or None if unknown
+            popularity_weight: Weight of the frequency score
+            authority_weight: Weight of the authority score
+            recency_weight: Weight of the recency score
+            
+        Returns:
+            Confidence score between 0 and 1
+        """
         # Weighted combination
         final_score = (
             base_score * 0.4 +  # Base match quality
-            frequency_score * weights.get('popularity', 0.2) +
-            authority_score * weights.get('authority', 0.3) +
-            recency_score * weights.get('recency', 0.3)
+            ConfidenceScorer._frequency_score(frequency_rank) * popularity_weight +
+            ConfidenceScorer._authority_score(is_official) * authority_weight +
+            ConfidenceScorer._recency_score(days_ago) * recency_weight
         )
         
         # Apply multipliers
         multipliers = [
-            self._frequency_multiplier(match_data.get('frequency_rank', 1)),
-            self._authority_multiplier(match_data.get('is_official_org', False)),
-            self._recency_multiplier(match_data.get('last_activity')),
+            ConfidenceScorer._frequency_multiplier(frequency_rank),
+            ConfidenceScorer._authority_multiplier(is_official),
+            ConfidenceScorer._recency_multiplier(days_ago),
         ]
         
         for multiplier in multipliers:
@@ -67,28 +169,51 @@ class ConfidenceScorer:
         # Ensure score is within bounds
         return min(1.0, max(0.0, final_score))
     
-    def _get_base_score(self, match_data: Dict[str, Any]) -> float:
+    @staticmethod
+    def _days_since(last_activity: Any, now: Optional[float] = None) -> Optional[int]:
+        """
+        Calculate the number of whole days since the last activity.
+        
+        Args:
+            last_activity: Last activity datetime
+            now: Unix timestamp to measure against (defaults to now)
+            
+        Returns:
+            Days since last activity, or None if it cannot be parsed
+        """
+        parsed = parse_datetime(last_activity)
+        if not parsed:
+            return None
+        
+        if now is None:
+            now = time.time()
+        # Naive datetimes are taken as local time, as datetime.now() would be
+        return int((now - parsed.timestamp()) // 86400)
+    
+    @staticmethod
+    def _get_base_score(record: MatchRecord) -> float:
         """
         Get base confidence score from match type.
         
         Args:
-            match_data: Match information
+            record: Match information
             
         Returns:
             Base score
         """
-        match_type = match_data.get('match_type')
+        # MatchType is a str enum, so it compares equal to its value
+        match_type = record.match_type
         
-        if match_type == 'exact' or match_type.value == 'exact':
+        if match_type == 'exact':
             return 0.9
-        elif match_type == 'fuzzy' or match_type.value == 'fuzzy':
+        elif match_type == 'fuzzy':
             # For fuzzy matches, use similarity score
-            similarity = match_data.get('similarity_score', 0.5)
-            return similarity * 0.8
+            return record.similarity_score * 0.8
         else:
             return 0.5
     
-    def _frequency_score(self, frequency_rank: int) -> float:
+    @staticmethod
+    def _frequency_score(frequency_rank: int) -> float:
         """
         Calculate score based on frequency/popularity.
         
@@ -111,7 +236,8 @@ class ConfidenceScorer:
         else:
             return 1.0
     
-    def _authority_score(self, is_official: bool) -> float:
+    @staticmethod
+    def _authority_score(is_official: bool) -> float:
         """
         Calculate score based on official organization status.
         
@@ -123,24 +249,19 @@ class ConfidenceScorer:
         """
         return 1.0 if is_official else 0.7
     
-    def _recency_score(self, last_activity: Any) -> float:
+    @staticmethod
+    def _recency_score(days_ago: Optional[int]) -> float:
         """
         Calculate score based on recency of activity.
         
         Args:
-            last_activity: Last activity datetime
+            days_ago: Days since last activity, or None if unknown
             
         Returns:
             Recency score between 0 and 1
         """
-        parsed = parse_datetime(last_activity)
-        if not parsed:
+        if days_ago is None:
             return 0.5
-        last_activity = parsed
-        
-        # Calculate days since last activity
-        now = datetime.now(last_activity.tzinfo) if last_activity.tzinfo else datetime.now()
-        days_ago = (now - last_activity).days
         
         if days_ago < 30:
             return 1.0
@@ -155,7 +276,8 @@ class ConfidenceScorer:
         else:
             return 0.5
     
-    def _frequency_multiplier(self, frequency_rank: int) -> float:
+    @staticmethod
+    def _frequency_multiplier(frequency_rank: int) -> float:
         """
         Boost confidence for frequently appearing packages.
         
@@ -176,7 +298,8 @@ class ConfidenceScorer:
         else:
             return 1.15
     
-    def _authority_multiplier(self, is_official: bool) -> float:
+    @staticmethod
+    def _authority_multiplier(is_official: bool) -> float:
         """
         Boost confidence for official organizations.
         
@@ -188,24 +311,19 @@ class ConfidenceScorer:
         """
         return 1.15 if is_official else 1.0
     
-    def _recency_multiplier(self, last_activity: Any) -> float:
+    @staticmethod
+    def _recency_multiplier(days_ago: Optional[int]) -> float:
         """
         Boost confidence for recently active repositories.
         
         Args:
-            last_activity: Last activity datetime
+            days_ago: Days since last activity, or None if unknown
             
         Returns:
             Multiplier value
         """
-        parsed = parse_datetime(last_activity)
-        if not parsed:
+        if days_ago is None:
             return 1.0
-        last_activity = parsed
-        
-        # Calculate days since last activity
-        now = datetime.now(last_activity.tzinfo) if last_activity.tzinfo else datetime.now()
-        days_ago = (now - last_activity).days
         
         if days_ago < 30:
             return 1.1
@@ -1,6 +1,7 @@
 """Detect and identify multiple subcomponents in a project."""
 
 import asyncio
+import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -10,6 +11,9 @@ from rich.table import Table
 
 console = Console()
 
+# Maximum number of subcomponents identified at the same time
+MAX_CONCURRENT_IDENTIFICATIONS = 4
+
 
 @dataclass
 class Subcomponent:
@@ -122,53 +126,56 @@ class SubcomponentDetector:
             return
         
         try:
-            for item in path.iterdir():
-                if item.is_dir() and item not in visited:
-                    # Skip common non-component directories
-                    if item.name in {'.git', '__pycache__', 'node_modules', 
-                                   'venv', 'build', 'dist', '.idea', '.vscode'}:
-                        continue
-                    
-                    # Check for package markers
-                    markers = self._check_markers(item)
+            with os.scandir(path) as entries:
+                subdirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+        except PermissionError:
+            return
+        
+        for item in subdirs:
+            if item not in visited:
+                # Skip common non-component directories
+                if item.name in {'.git', '__pycache__', 'node_modules', 
+                               'venv', 'build', 'dist', '.idea', '.vscode'}:
+                    continue
+                
+                # Check for package markers
+                markers = self._check_markers(item)
+                
+                if markers:
+                    # Found a subcomponent
+                    component = Subcomponent(
+                        path=item,
+                        type=self._determine_type(markers),
+                        name=item.name,
+                        markers=markers
+                    )
+                    subcomponents.append(component)
+                    visited.add(item)
                     
-                    if markers:
-                        # Found a subcomponent
-                        component = Subcomponent(
-                            path=item,
-                            type=self._determine_type(markers),
-                            name=item.name,
-                            markers=markers
-                        )
-                        subcomponents.append(component)
-                        visited.add(item)
-                        
-                        # Don't scan inside detected components by default
-                        # unless it's a monorepo pattern
-                        if self._is_monorepo_pattern(item):
-                            self._scan_for_subcomponents(
-                                item, subcomponents, visited,
-                                current_depth + 1, max_depth
-                            )
-                    else:
-                        # Continue scanning subdirectories
+                    # Don't scan inside detected components by default
+                    # unless it's a monorepo pattern
+                    if self._is_monorepo_pattern(item):
                         self._scan_for_subcomponents(
                             item, subcomponents, visited,
                             current_depth + 1, max_depth
                         )
-        except PermissionError:
-            pass
+                else:
+                    # Continue scanning subdirectories
+                    self._scan_for_subcomponents(
+                        item, subcomponents, visited,
+                        current_depth + 1, max_depth
+                    )
     
     def _check_markers(self, path: Path) -> List[str]:
         """Check for package markers in a directory."""
-        markers = []
-        
-        for marker_file, _ in self.PACKAGE_MARKERS.items():
-            marker_path = path / marker_file
-            if marker_path.exists():
-                markers.append(marker_file)
+        # List the directory once instead of stat'ing every marker name
+        try:
+            with os.scandir(path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            return []
         
-        return markers
+        return [marker for marker in self.PACKAGE_MARKERS if marker in names]
     
     def _determine_type(self, markers: List[str]) -> str:
         """Determine component type from markers."""
@@ -308,40 +315,63 @@ async def identify_subcomponents(
     if verbose:
         console.print(f"\n[bold]Identifying {len(subcomponents)} subcomponents...[/bold]\n")
     
-    for i, comp in enumerate(subcomponents, 1):
-        if verbose:
-            console.print(f"[cyan]Component {i}/{len(subcomponents)}: {comp.path.name}[/cyan]")
-        
-        # Identify this component
-        comp_result = await identify_source(
-            path=comp.path,
-            max_depth=1,  # Don't go too deep for subcomponents
-            confidence_threshold=confidence_threshold,
-            verbose=False,  # Less verbose for individual components
-            use_swh=use_swh
-        )
-        
-        # Add component info to result
-        comp_info = {
-            "path": str(comp.path),
-            "type": comp.type,
-            "markers": comp.markers,
-            "identified": comp_result["identified"],
-            "confidence": comp_result["confidence"],
-            "repository": comp_result.get("final_origin"),
-            "strategies_used": comp_result.get("strategies_used", [])
-        }
-        
-        results["subcomponents"].append(comp_info)
-        
-        if comp_result["identified"]:
-            results["total_identified"] += 1
+    # Identify components concurrently, bounded so that a large monorepo does
+    # not open an unbounded number of sessions at once
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_IDENTIFICATIONS)
+    
+    async def identify_component(index: int, comp: Subcomponent):
+        async with semaphore:
+            comp_result = await identify_source(
+                path=comp.path,
+                max_depth=1,  # Don't go too deep for subcomponents
+                confidence_threshold=confidence_threshold,
+                verbose=False,  # Less verbose for individual components
+                use_swh=use_swh
+            )
+        return index, comp, comp_result
+    
+    tasks = [
+        asyncio.create_task(identify_component(i, comp))
+        for i, comp in enumerate(subcomponents)
+    ]
+    
+    # Consume results as soon as each component finishes rather than
+    # waiting on the slowest one
+    completed = []
+    try:
+        for done, future in enumerate(asyncio.as_completed(tasks), 1):
+            index, comp, comp_result = await future
+            
+            # Add component info to result
+            comp_info = {
+                "path": str(comp.path),
+                "type": comp.type,
+                "markers": comp.markers,
+                "identified": comp_result["identified"],
+                "confidence": comp_result["confidence"],
+                "repository": comp_result.get("final_origin"),
+                "strategies_used": comp_result.get("strategies_used", [])
+            }
+            completed.append((index, comp_info))
             
-        if verbose:
             if comp_result["identified"]:
-                console.print(f"  ✓ Identified: {comp_result['final_origin']}")
-            else:
-                console.print(f"  ✗ Not identified")
+                results["total_identified"] += 1
+                
+            if verbose:
+                console.print(f"[cyan]Component {done}/{len(subcomponents)}: {comp.path.name}[/cyan]")
+                if comp_result["identified"]:
+                    console.print(f"  ✓ Identified: {comp_result['final_origin']}")
+                else:
+                    console.print(f"  ✗ Not identified")
+    finally:
+        # A failed identification must not leave the others running unawaited
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Report components in detection order
+    completed.sort(key=lambda item: item[0])
+    results["subcomponents"] = [comp_info for _, comp_info in completed]
     
     # Print summary
     if verbose:
@@ -1,9 +1,15 @@
 """SWHID generation using Software Heritage tools."""
 
 import hashlib
+import mmap
 import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Hashable, List, Optional, Tuple
 
 # Try different SWHID generation methods in order of preference
 HAS_SWH_MODEL = False
@@ -26,6 +32,132 @@ except ImportError:
         )
 
 
+# Files up to this size are read whole and hashed with the git header in a
+# single constructor call; for them the per-call setup of the streaming
+# paths below costs more than the copy
+SMALL_FILE_THRESHOLD = 64 * 1024
+
+# Files at least this large are hashed from a memory map in a single update
+# call instead of being copied into a bytes object first
+MMAP_THRESHOLD = 1 << 20
+
+# hashlib.file_digest (Python 3.11+) hashes through a reused buffer with the
+# GIL released, without building a bytes object of the whole file
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Directories with at least this many files have their files hashed on a
+# thread pool; hashlib releases the GIL while hashing
+PARALLEL_HASH_MIN_FILES = 64
+
+# Created on first use and shared by every generator, so the orchestrator,
+# strategies and detectors that each build one do not each keep idle workers
+_hash_pool: Optional[ThreadPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+# Most entries kept by each of a generator's per-file caches; enough for the
+# files of a large checkout without growing for the life of the process
+FILE_CACHE_SIZE = 1 << 16
+
+# Directories never descended into by the fallback directory hash
+FALLBACK_SKIP_DIRS = frozenset({'__pycache__', 'node_modules', 'build', 'dist', 'target'})
+
+# Sort key for tuples of path parts that matches how Path objects compare:
+# part by part, and case-insensitively on Windows
+_PARTS_SORT_KEY = (
+    (lambda parts: tuple(part.lower() for part in parts)) if os.name == 'nt' else None
+)
+
+# Bytes of directory entries collected before they are fed to the hasher
+HASH_BUFFER_SIZE = 64 * 1024
+
+# Core SWHID: version 1, a known object type and a hex SHA1
+_SWHID_RE = re.compile(r'swh:1:(?:cnt|dir|rev|rel|snp|ori):[0-9a-fA-F]{40}')
+
+# SWHID of the empty blob, shared by every empty __init__.py, .gitkeep, etc.
+EMPTY_CONTENT_SWHID = "swh:1:cnt:e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    """Return the thread pool used to hash files of large directories."""
+    global _hash_pool
+    
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix="swhid-hash"
+            )
+        return _hash_pool
+
+
+def _sha1_of_file(f: BinaryIO, git_blob: bool = False) -> "hashlib._Hash":
+    """
+    Hash an open binary file with SHA1.
+    
+    SHA1 only identifies content here, so the hashers are created with
+    usedforsecurity=False and stay available under FIPS-restricted OpenSSL.
+    
+    Args:
+        f: File opened in binary mode, preferably unbuffered
+        git_blob: Prefix the content with a git blob header
+        
+    Returns:
+        hashlib SHA1 object fed with the file content
+    """
+    size = os.fstat(f.fileno()).st_size
+    
+    if size <= SMALL_FILE_THRESHOLD:
+        content = f.read()
+        header = b"blob %d\0" % len(content) if git_blob else b""
+        return hashlib.sha1(header + content, usedforsecurity=False)
+    
+    if size >= MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            hasher = hashlib.sha1(
+                b"blob %d\0" % len(mapped) if git_blob else b"", usedforsecurity=False
+            )
+            hasher.update(mapped)
+            return hasher
+    
+    if _file_digest is not None:
+        header = b"blob %d\0" % size if git_blob else b""
+        return _file_digest(f, lambda: hashlib.sha1(header, usedforsecurity=False))
+    
+    content = f.read()
+    hasher = hashlib.sha1(
+        b"blob %d\0" % len(content) if git_blob else b"", usedforsecurity=False
+    )
+    hasher.update(content)
+    return hasher
+
+
+class _LRUCache:
+    """Thread-safe mapping that only keeps its most recently used entries."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Any:
+        """Return the value for key, or None, marking it as recently used."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class SWHIDGenerator:
     """
     Generates Software Heritage Identifiers using miniswhid or custom implementation.
@@ -40,6 +172,14 @@ class SWHIDGenerator:
         """
         self.use_swh_model = use_swh_model and HAS_SWH_MODEL
         self.use_miniswhid = (not self.use_swh_model) and HAS_MINISWHID
+        
+        # Content SWHIDs by (device, inode, mtime_ns, size), so hardlinks are
+        # hashed once; symlinks are never cached, see generate_content_swhid
+        self._content_cache = _LRUCache(FILE_CACHE_SIZE)
+        
+        # Plain SHA1 digests for the fallback directory hash, keyed the same
+        # way; nested directory candidates share most of their files
+        self._file_digest_cache = _LRUCache(FILE_CACHE_SIZE)
     
     def generate_directory_swhid(self, path: Path) -> str:
         """
@@ -185,50 +325,44 @@ class SWHIDGenerator:
             SWHID string
         """
         # Create a hash of the directory structure and content
-        hasher = hashlib.sha1()
-        
-        # Get all files in sorted order for consistency
-        all_files = []
-        for root, dirs, files in os.walk(path):
-            # Skip hidden and build directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {
-                '__pycache__', 'node_modules', 'build', 'dist', 'target'
-            }]
-            dirs.sort()  # Ensure consistent ordering
-            
-            for file in sorted(files):
-                if not file.startswith('.'):
-                    file_path = Path(root) / file
-                    relative_path = file_path.relative_to(path)
-                    all_files.append(relative_path)
-        
-        # Sort all files for consistent ordering
-        all_files.sort()
-        
-        # Hash the directory structure
-        for relative_path in all_files:
-            file_path = path / relative_path
-            
+        hasher = hashlib.sha1(usedforsecurity=False)
+        
+        # Get all files in sorted order for consistency; sorting the path
+        # parts orders them the same way as sorting Path objects
+        all_files = self._list_fallback_files(os.fspath(path))
+        all_files.sort(key=_PARTS_SORT_KEY)
+        
+        relative_paths = [os.sep.join(parts) for parts in all_files]
+        
+        # Hash the files independently, in parallel for larger trees
+        file_paths = [os.path.join(path, relative_path) for relative_path in relative_paths]
+        if len(file_paths) >= PARALLEL_HASH_MIN_FILES:
+            file_entries = _get_hash_pool().map(
+                self._hash_file_entry, file_paths, chunksize=16
+            )
+        else:
+            file_entries = map(self._hash_file_entry, file_paths)
+        
+        # Hash the directory structure. The per-file pieces are small, so
+        # they are collected in a buffer that is fed to the hasher in
+        # blocks instead of with three update calls per file.
+        buf = bytearray()
+        for relative_path, (digest, mode) in zip(relative_paths, file_entries):
             # Add file path to hash
-            hasher.update(str(relative_path).encode('utf-8'))
+            buf += relative_path.encode('utf-8')
             
-            # Add file content hash
-            try:
-                with open(file_path, 'rb') as f:
-                    file_hasher = hashlib.sha1()
-                    while chunk := f.read(8192):
-                        file_hasher.update(chunk)
-                    hasher.update(file_hasher.digest())
-            except (PermissionError, OSError):
-                # Skip files we can't read
+            # Skip files we can't read
+            if digest is None:
                 continue
             
-            # Add file mode (simplified)
-            try:
-                mode = oct(file_path.stat().st_mode)[-3:]
-                hasher.update(mode.encode('utf-8'))
-            except (PermissionError, OSError):
-                hasher.update(b'644')  # Default mode
+            # Add file content hash and mode
+            buf += digest
+            buf += mode
+            
+            if len(buf) >= HASH_BUFFER_SIZE:
+                hasher.update(buf)
+                buf.clear()
+        hasher.update(buf)
         
         # Generate the final hash
         dir_hash = hasher.hexdigest()
@@ -237,30 +371,141 @@ class SWHIDGenerator:
         # Note: This is a simplified format and may not match SH exactly
         return f"swh:1:dir:{dir_hash}"
     
-    def generate_content_swhid(self, file_path: Path) -> str:
+    @staticmethod
+    def _list_fallback_files(root: str) -> List[Tuple[str, ...]]:
+        """
+        List the files covered by the fallback directory hash.
+        
+        Hidden entries and build directories are skipped, and symlinked
+        directories are not followed. Entries are typed from the directory
+        listing itself, so no file is stat'ed here.
+        
+        Args:
+            root: Directory path
+            
+        Returns:
+            Relative file paths as tuples of path parts, unsorted
+        """
+        files = []
+        stack = [((), root)]
+        while stack:
+            parts, dir_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if not is_dir:
+                    files.append(parts + (entry.name,))
+                elif entry.name not in FALLBACK_SKIP_DIRS and not entry.is_symlink():
+                    stack.append((parts + (entry.name,), entry.path))
+        
+        return files
+    
+    def _hash_file_entry(self, file_path: str) -> Tuple[Optional[bytes], bytes]:
+        """
+        Hash one file for the fallback directory hash.
+        
+        Digests are remembered by (device, inode, mtime_ns, size), so a file
+        is only read again once it has been modified.
+        
+        Args:
+            file_path: File path
+            
+        Returns:
+            Tuple of (SHA1 digest of the content, or None if unreadable,
+            simplified file mode)
+        """
+        try:
+            st = os.stat(file_path)
+        except (PermissionError, OSError):
+            return None, b''
+        
+        # Simplified file mode
+        mode = oct(st.st_mode)[-3:].encode('utf-8')
+        
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        digest = self._file_digest_cache.get(key)
+        if digest is None:
+            try:
+                with open(file_path, 'rb', buffering=0) as f:
+                    digest = _sha1_of_file(f).digest()
+            except (PermissionError, OSError):
+                return None, b''
+            self._file_digest_cache[key] = digest
+        
+        return digest, mode
+    
+    def generate_content_swhid(
+        self,
+        file_path: Path,
+        st: Optional[os.stat_result] = None
+    ) -> str:
         """
         Generate SWHID for file content.
         
         Args:
             file_path: File path
+            st: Stat result of the file itself (not following symlinks), if
+                the caller already has one
             
         Returns:
             SWHID string for the file content
         """
-        if not file_path.is_file():
+        if st is None:
+            try:
+                st = os.lstat(file_path)
+            except OSError:
+                raise ValueError(f"Not a file: {file_path}")
+        
+        # Like git and swh.model, a symlink's content is the path it points
+        # to, never its target's content; reading it is one readlink, so
+        # symlinks skip the cache rather than share their target's entry
+        if stat.S_ISLNK(st.st_mode):
+            if not os.path.isfile(file_path):
+                raise ValueError(f"Not a file: {file_path}")
+            target = os.readlink(os.fsencode(file_path))
+            hasher = hashlib.sha1(b"blob %d\0" % len(target), usedforsecurity=False)
+            hasher.update(target)
+            return f"swh:1:cnt:{hasher.hexdigest()}"
+        
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Not a file: {file_path}")
         
+        if st.st_size == 0:
+            return EMPTY_CONTENT_SWHID
+        
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        swhid = None
         if self.use_swh_model:
             try:
                 # Use official SWH model for accurate content hashing
                 content = Content.from_file(path=file_path, max_content_length=10_000_000)
-                return str(content.swhid())
+                swhid = str(content.swhid())
             except Exception:
                 # Fall back to basic implementation
                 pass
         
-        # Fallback: Generate git-compatible SHA1
-        return self._hash_file_content(file_path)
+        if swhid is None:
+            # Fallback: Generate git-compatible SHA1
+            swhid = self._hash_file_content(file_path)
+        
+        self._content_cache[key] = swhid
+        return swhid
     
     def _hash_file_content(self, file_path: Path) -> str:
         """
@@ -272,15 +517,12 @@ class SWHIDGenerator:
         Returns:
             SWHID string for content
         """
-        hasher = hashlib.sha1()
-        
         try:
-            with open(file_path, 'rb') as f:
-                # Add git-style header
-                content = f.read()
-                header = f"blob {len(content)}\0".encode('utf-8')
-                hasher.update(header)
-                hasher.update(content)
+            # Unbuffered: every read path below fills its own buffer or maps
+            # the file, so a BufferedReader would only add a copy
+            with open(file_path, 'rb', buffering=0) as f:
+                # Hash with git-style header
+                hasher = _sha1_of_file(f, git_blob=True)
         except (PermissionError, OSError) as e:
             raise ValueError(f"Cannot read file {file_path}: {e}")
         
@@ -300,25 +542,4 @@ class SWHIDGenerator:
         if not isinstance(swhid, str):
             return False
         
-        parts = swhid.split(':')
-        if len(parts) != 4:
-            return False
-        
-        if parts[0] != 'swh':
-            return False
-        
-        if parts[1] != '1':  # Version
-            return False
-        
-        if parts[2] not in {'cnt', 'dir', 'rev', 'rel', 'snp', 'ori'}:
-            return False
-        
-        # Check if hash is valid hex
-        try:
-            int(parts[3], 16)
-            if len(parts[3]) != 40:  # SHA1 length
-                return False
-        except ValueError:
-            return False
-        
-        return True
\ No newline at end of file
+        return _SWHID_RE.fullmatch(swhid) is not None
\ No newline at end of file
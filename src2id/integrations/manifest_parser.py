@@ -176,6 +176,11 @@ class DirectManifestParser:
             homepage = data.get('homepage')
             repository = data.get('repository', {})
 
+            # Author is either "Name <email> (url)" or {"name": ...}
+            author = data.get('author')
+            if isinstance(author, dict):
+                author = author.get('name')
+
             # Extract repository URL
             repo_url = None
             if isinstance(repository, dict):
@@ -208,6 +213,9 @@ class DirectManifestParser:
                 license=license_info,
                 purl=purl,
                 is_official_org=self._is_official_npm_org(repo_url or homepage or ''),
+                author=author if isinstance(author, str) else None,
+                homepage=homepage,
+                repository_url=repo_url,
             )
 
         except (json.JSONDecodeError, KeyError, FileNotFoundError):
@@ -239,6 +247,13 @@ class DirectManifestParser:
             homepage = urls.get('Homepage') or urls.get('home')
             repository = urls.get('Repository') or urls.get('repository')
 
+            # Authors are tables with an optional name and email
+            author = None
+            for entry in project.get('authors', []):
+                if isinstance(entry, dict) and entry.get('name'):
+                    author = entry['name']
+                    break
+
             # Generate PURL
             purl = None
             if name:
@@ -255,6 +270,9 @@ class DirectManifestParser:
                 license=license_info,
                 purl=purl,
                 is_official_org=self._is_official_python_org(repository or homepage or ''),
+                author=author,
+                homepage=homepage,
+                repository_url=repository,
             )
 
         except (tomllib.TOMLDecodeError, KeyError, FileNotFoundError):
@@ -271,11 +289,13 @@ class DirectManifestParser:
             version_match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
             license_match = re.search(r'license\s*=\s*["\']([^"\']+)["\']', content)
             url_match = re.search(r'url\s*=\s*["\']([^"\']+)["\']', content)
+            author_match = re.search(r'author\s*=\s*["\']([^"\']+)["\']', content)
 
             name = name_match.group(1) if name_match else None
             version = version_match.group(1) if version_match else None
             license_info = license_match.group(1) if license_match else None
             url = url_match.group(1) if url_match else None
+            author = author_match.group(1) if author_match else None
 
             if not name:
                 return None
@@ -294,6 +314,8 @@ class DirectManifestParser:
                 license=license_info,
                 purl=purl,
                 is_official_org=self._is_official_python_org(url or ''),
+                author=author,
+                homepage=url,
             )
 
         except (FileNotFoundError, UnicodeDecodeError):
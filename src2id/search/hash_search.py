@@ -2,7 +2,7 @@
 
 import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import asyncio
 
 from rich.console import Console
@@ -28,6 +28,11 @@ class HashSearcher:
         """
         self.verbose = verbose
         self.search_registry = search_registry
+        
+        # Search results by hash value. Hashes are content-addressed, so
+        # identical files found anywhere in a scan share one search
+        self._search_cache: Dict[str, List[str]] = {}
+        self._pending_searches: Dict[str, asyncio.Future] = {}
     
     def compute_file_hashes(self, file_path: Path) -> Dict[str, str]:
         """Compute various hashes for a file.
@@ -44,13 +49,13 @@ class HashSearcher:
             content = file_path.read_bytes()
             
             # SHA1 (used by Git and SWH)
-            sha1 = hashlib.sha1(content).hexdigest()
+            sha1 = hashlib.sha1(content, usedforsecurity=False).hexdigest()
             hashes['sha1'] = sha1
             
             # Git blob hash (includes header)
             git_header = f"blob {len(content)}\0".encode()
             git_content = git_header + content
-            git_sha1 = hashlib.sha1(git_content).hexdigest()
+            git_sha1 = hashlib.sha1(git_content, usedforsecurity=False).hexdigest()
             hashes['sha1_git'] = git_sha1
             
             # SHA256 (modern standard)
@@ -58,7 +63,7 @@ class HashSearcher:
             hashes['sha256'] = sha256
             
             # MD5 (legacy, but still used)
-            md5 = hashlib.md5(content).hexdigest()
+            md5 = hashlib.md5(content, usedforsecurity=False).hexdigest()
             hashes['md5'] = md5
             
         except Exception as e:
@@ -86,7 +91,7 @@ class HashSearcher:
                 if item.is_file():
                     try:
                         content = item.read_bytes()
-                        sha1 = hashlib.sha1(content).hexdigest()
+                        sha1 = hashlib.sha1(content, usedforsecurity=False).hexdigest()
                         entries.append(f"100644 {item.name}\0{bytes.fromhex(sha1)}")
                     except:
                         pass
@@ -98,7 +103,7 @@ class HashSearcher:
             
             if entries:
                 tree_content = b''.join(e.encode() if isinstance(e, str) else e for e in entries)
-                return hashlib.sha1(tree_content).hexdigest()
+                return hashlib.sha1(tree_content, usedforsecurity=False).hexdigest()
                 
         except Exception as e:
             if self.verbose:
@@ -123,7 +128,58 @@ class HashSearcher:
         if not self.search_registry:
             return []
         
+        if hash_value in self._search_cache:
+            return list(self._search_cache[hash_value])
+        
+        # Identical files searched concurrently wait for the first search
+        while hash_value in self._pending_searches:
+            pending = self._pending_searches[hash_value]
+            try:
+                return list(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # Only the first search was cancelled; search again
+                if not pending.cancelled():
+                    raise
+            if hash_value in self._search_cache:
+                return list(self._search_cache[hash_value])
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_searches[hash_value] = future
+        try:
+            urls, complete = await self._search_hash_uncached(hash_value, hash_type)
+            # Failed queries are retried by the next search for this hash
+            if complete:
+                self._search_cache[hash_value] = urls
+            future.set_result(urls)
+            return list(urls)
+        except asyncio.CancelledError:
+            # Waiters retry instead of inheriting this search's cancellation
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._pending_searches[hash_value]
+    
+    async def _search_hash_uncached(
+        self,
+        hash_value: str,
+        hash_type: str
+    ) -> Tuple[List[str], bool]:
+        """Run the provider searches for a hash value.
+        
+        Args:
+            hash_value: The hash value to search for
+            hash_type: Type of hash (sha1, sha256, md5, auto)
+            
+        Returns:
+            Tuple of (unique repository URLs, whether every query succeeded)
+        """
         all_urls = set()
+        complete = True
         
         # Determine hash type if auto
         if hash_type == "auto":
@@ -155,12 +211,15 @@ class HashSearcher:
                 if isinstance(result, dict):
                     for provider, urls in result.items():
                         all_urls.update(urls)
+                else:
+                    complete = False
                         
         except Exception as e:
+            complete = False
             if self.verbose:
                 console.print(f"[yellow]Search error: {e}[/yellow]")
         
-        return list(all_urls)
+        return list(all_urls), complete
     
     async def search_file(
         self,
@@ -179,7 +238,8 @@ class HashSearcher:
                 console.print(f"[red]File not found: {file_path}[/red]")
             return {}
         
-        hashes = self.compute_file_hashes(file_path)
+        # Reading and hashing the file would otherwise block the event loop
+        hashes = await asyncio.to_thread(self.compute_file_hashes, file_path)
         
         if self.verbose:
             console.print(f"\n[bold]Computed hashes for {file_path.name}:[/bold]")
@@ -203,4 +263,32 @@ class HashSearcher:
                     if self.verbose:
                         console.print(f"[green]Found {len(urls)} results for {hash_type}[/green]")
         
-        return results
\ No newline at end of file
+        return results
+    
+    async def search_files(
+        self,
+        file_paths: List[Path]
+    ) -> Dict[Path, Dict[str, List[str]]]:
+        """Search for several files concurrently.
+        
+        Args:
+            file_paths: Paths to the files
+            
+        Returns:
+            Dictionary mapping each file with results to its search results
+        """
+        task_results = await asyncio.gather(
+            *(self.search_file(file_path) for file_path in file_paths),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for file_path, result in zip(file_paths, task_results):
+            if isinstance(result, Exception):
+                if self.verbose:
+                    console.print(f"[yellow]Search error for {file_path}: {result}[/yellow]")
+                continue
+            if result:
+                results[file_path] = result
+        
+        return results
@@ -1,11 +1,13 @@
 """Search providers for source identification."""
 
 import os
+import re
 import json
 import hashlib
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
 import asyncio
 
 import aiohttp
@@ -13,6 +15,9 @@ from rich.console import Console
 
 console = Console()
 
+# hashlib.file_digest (Python 3.11+) hashes an open file through a reused buffer
+_file_digest = getattr(hashlib, "file_digest", None)
+
 
 class SearchProvider(ABC):
     """Abstract base class for search providers."""
@@ -22,6 +27,9 @@ class SearchProvider(ABC):
         self.api_key = api_key
         self.verbose = verbose
         self.session = None
+        # Set by SearchProviderRegistry.register_provider to share its session
+        self.registry: Optional["SearchProviderRegistry"] = None
+        self._owns_session = False
     
     @property
     @abstractmethod
@@ -41,20 +49,24 @@ class SearchProvider(ABC):
         pass
     
     async def ensure_session(self):
-        """Ensure we have an active session."""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        """Ensure we have an active session, preferring the registry's pool."""
+        if not self.session or self.session.closed:
+            if self.registry is not None:
+                self.session = await self.registry.get_session()
+                self._owns_session = False
+            else:
+                self.session = aiohttp.ClientSession()
+                self._owns_session = True
     
     async def close(self):
-        """Close the session."""
-        if self.session:
+        """Close the session, or release the registry's shared one."""
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
+        self._owns_session = False
     
     def extract_repo_urls(self, urls: List[str]) -> List[str]:
         """Extract and filter repository URLs from a list of URLs."""
-        from urllib.parse import urlparse
-
         repo_urls = []
         for url in urls:
             try:
@@ -141,7 +153,6 @@ class GitHubSearchProvider(SearchProvider):
             headers["Authorization"] = f"token {self.api_key}"
         
         # Extract search terms
-        import re
         search_terms = re.findall(r'"([^"]+)"', query)
         if not search_terms:
             search_terms = [query]
@@ -214,36 +225,78 @@ class SCANOSSProvider(SearchProvider):
         await self.ensure_session()
         
         try:
-            content = file_path.read_bytes()
-            wfp = self._create_wfp(file_path, content)
-            
-            headers = {'User-Agent': 'swhpi-scanner/1.0'}
-            if self.api_key:
-                headers['X-Session'] = self.api_key
-            
-            form_data = aiohttp.FormData()
-            form_data.add_field('file', wfp, filename='scan.wfp')
-            form_data.add_field('format', 'plain')
-            
-            async with self.session.post(
-                self.url,
-                data=form_data,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 200:
-                    result_text = await response.text()
-                    return json.loads(result_text)
-                return {}
+            wfp = await asyncio.to_thread(self._create_wfp, file_path)
+            return await self._post_wfp(wfp)
         except Exception as e:
             if self.verbose:
                 console.print(f"[red]SCANOSS error: {e}[/red]")
             return {}
     
-    def _create_wfp(self, file_path: Path, content: bytes) -> str:
-        """Create simplified WFP for SCANOSS."""
-        md5_hash = hashlib.md5(content).hexdigest()
-        return f"file={md5_hash},{len(content)},{file_path.name}\n1=00000000"
+    async def scan_files(self, file_paths: List[Path]) -> Dict:
+        """Scan several files with a single SCANOSS request.
+        
+        The WFP format accepts many ``file=`` blocks per request, so all
+        fingerprints are posted together and the response is keyed by file name.
+        """
+        if not file_paths:
+            return {}
+        
+        await self.ensure_session()
+        
+        try:
+            wfp = await asyncio.to_thread(self._create_wfps, file_paths)
+            return await self._post_wfp(wfp)
+        except Exception as e:
+            if self.verbose:
+                console.print(f"[red]SCANOSS batch error: {e}[/red]")
+            return {}
+    
+    async def _post_wfp(self, wfp: str) -> Dict:
+        """Submit a WFP payload and return the parsed JSON response."""
+        headers = {'User-Agent': 'swhpi-scanner/1.0'}
+        if self.api_key:
+            headers['X-Session'] = self.api_key
+        
+        form_data = aiohttp.FormData()
+        form_data.add_field('file', wfp, filename='scan.wfp')
+        form_data.add_field('format', 'plain')
+        
+        async with self.session.post(
+            self.url,
+            data=form_data,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                result_text = await response.text()
+                return json.loads(result_text)
+            return {}
+    
+    def _create_wfps(self, file_paths: List[Path]) -> str:
+        """Create a combined WFP for several files, skipping unreadable ones."""
+        blocks = []
+        for file_path in file_paths:
+            try:
+                blocks.append(self._create_wfp(file_path))
+            except OSError:
+                continue
+        return "\n".join(blocks)
+    
+    def _create_wfp(self, file_path: Path) -> str:
+        """Create simplified WFP for SCANOSS.
+        
+        Only the MD5 and size of the file are sent, so the content is hashed
+        from the open file rather than read into memory as a whole.
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if _file_digest is not None:
+                md5_hash = _file_digest(
+                    f, lambda: hashlib.md5(usedforsecurity=False)
+                ).hexdigest()
+            else:
+                md5_hash = hashlib.md5(f.read(), usedforsecurity=False).hexdigest()
+        return f"file={md5_hash},{size},{file_path.name}\n1=00000000"
 
 
 class SearchProviderRegistry:
@@ -253,11 +306,30 @@ class SearchProviderRegistry:
         """Initialize the registry."""
         self.providers: Dict[str, SearchProvider] = {}
         self.verbose = verbose
+        self._session: Optional[aiohttp.ClientSession] = None
     
     def register_provider(self, name: str, provider: SearchProvider):
         """Register a search provider."""
+        provider.registry = self
         self.providers[name] = provider
     
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the session shared by all registered providers.
+        
+        Pooling connections across providers and requests lets repeated
+        calls to the same API reuse keep-alive connections instead of
+        paying a new TCP and TLS handshake each time.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
     def get_provider(self, name: str) -> Optional[SearchProvider]:
         """Get a provider by name."""
         return self.providers.get(name)
@@ -280,6 +352,9 @@ class SearchProviderRegistry:
         """Close all provider sessions."""
         for provider in self.providers.values():
             await provider.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 
 def create_default_registry(verbose: bool = False) -> SearchProviderRegistry:
@@ -3,15 +3,18 @@
 import asyncio
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from collections import Counter
+from urllib.parse import urlparse
 
 from rich.console import Console
 from rich.table import Table
 
-from ..core.models import DirectoryCandidate, ContentCandidate
+from ..core.config import SWHPIConfig
+from ..core.models import DirectoryCandidate, ContentCandidate, PackageMatch
 from ..core.scanner import DirectoryScanner
 from ..core.client import SoftwareHeritageClient
+from ..integrations.manifest_parser import DirectManifestParser
 from .hash_search import HashSearcher
 from .providers import (
     SearchProviderRegistry,
@@ -21,6 +24,56 @@ from .providers import (
 
 console = Console()
 
+# Top-level manifests checked by the metadata strategy
+METADATA_FILES = ('package.json', 'pyproject.toml', 'setup.py')
+
+# A strategy only stops the others when its best candidate clears the
+# threshold by this much, so a borderline match cannot decide on its own
+STOP_MARGIN = 0.1
+
+# Strategies whose candidates carry a fixed confidence rather than one
+# backed by matched content; they never stop the others early
+INCONCLUSIVE_STRATEGIES = ('web_search',)
+
+
+def _first_of_each(root: Path, limits: Dict[str, int]) -> Dict[str, List[Path]]:
+    """Collect the first files of each suffix in a single directory walk.
+    
+    Args:
+        root: Directory to walk
+        limits: Maximum number of files to collect per suffix
+        
+    Returns:
+        Dictionary mapping each suffix to the files found, in walk order
+    """
+    samples = {suffix: [] for suffix in limits}
+    remaining = sum(limits.values())
+    stack = [root]
+    
+    while stack and remaining > 0:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    
+                    suffix = os.path.splitext(entry.name)[1]
+                    bucket = samples.get(suffix)
+                    if bucket is not None and len(bucket) < limits[suffix] and entry.is_file():
+                        bucket.append(Path(entry.path))
+                        remaining -= 1
+                        if remaining == 0:
+                            break
+        except OSError:
+            continue
+        
+        # Reverse so directories are visited in listing order
+        stack.extend(reversed(subdirs))
+    
+    return samples
+
 
 class SourceIdentifier:
     """Unified source identification using multiple strategies."""
@@ -42,7 +95,12 @@ class SourceIdentifier:
         self.swh_client = swh_client
         self.search_registry = search_registry or create_default_registry(verbose=verbose)
         self.verbose = verbose
-        self.hash_searcher = HashSearcher(verbose=verbose)
+        # Share the registry so its providers (and sessions) are created
+        # and closed once per identifier
+        self.hash_searcher = HashSearcher(
+            search_registry=self.search_registry,
+            verbose=verbose
+        )
         self._swh_config = None  # Store config for lazy initialization
     
     async def identify(
@@ -51,7 +109,8 @@ class SourceIdentifier:
         max_depth: int = 3,
         confidence_threshold: float = 0.5,
         strategies: Optional[List[str]] = None,
-        use_swh: bool = False
+        use_swh: bool = False,
+        exhaustive: bool = False
     ) -> Dict[str, Any]:
         """Identify the source of a directory using multiple strategies.
         
@@ -61,20 +120,54 @@ class SourceIdentifier:
             confidence_threshold: Minimum confidence for identification
             strategies: List of strategies to use (default: optimized order)
             use_swh: Whether to include Software Heritage checking
+            exhaustive: Run every strategy even after one of them returns a
+                candidate reaching confidence_threshold
             
         Returns:
             Dictionary with identification results
         """
-        results = {
+        gathered = await self.gather_candidates(
+            path,
+            max_depth=max_depth,
+            strategies=strategies,
+            use_swh=use_swh,
+            stop_threshold=None if exhaustive else confidence_threshold
+        )
+        return self.apply_threshold(gathered, confidence_threshold)
+    
+    async def gather_candidates(
+        self,
+        path: Path,
+        max_depth: int = 3,
+        strategies: Optional[List[str]] = None,
+        use_swh: bool = False,
+        stop_threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Run the identification strategies and collect their candidates.
+        
+        This is the expensive phase of identification; the result can be
+        passed to apply_threshold any number of times.
+        
+        Args:
+            path: Path to analyze
+            max_depth: Maximum depth for recursive scanning
+            strategies: List of strategies to use (default: optimized order)
+            use_swh: Whether to include Software Heritage checking
+            stop_threshold: Stop running strategies once one returns a
+                candidate clearing this confidence by STOP_MARGIN (None to
+                run them all); web search hits never stop the others
+            
+        Returns:
+            Dictionary with the path, strategies used and all candidates
+        """
+        gathered = {
             "path": str(path),
-            "identified": False,
-            "confidence": 0.0,
             "strategies_used": [],
-            "candidates": [],
-            "final_origin": None
+            "candidates": []
         }
         
         available_strategies = {
+            "metadata": self._identify_via_metadata,
             "hash_search": self._identify_via_hash_search,
             "web_search": self._identify_via_web_search,
             "scanoss": self._identify_via_scanoss,
@@ -83,41 +176,135 @@ class SourceIdentifier:
         
         # Default optimized order (local methods first, then external APIs)
         if strategies is None:
-            strategies_to_use = ["hash_search", "web_search", "scanoss"]
+            strategies_to_use = ["metadata", "hash_search", "web_search", "scanoss"]
             if use_swh:
                 strategies_to_use.append("swh")
         else:
             strategies_to_use = strategies
         
-        all_candidates = []
+        selected = [name for name in strategies_to_use if name in available_strategies]
         
-        for strategy_name in strategies_to_use:
-            if strategy_name not in available_strategies:
-                continue
-                
-            strategy_func = available_strategies[strategy_name]
+        def reaches_stop(name: str, candidates: List[Dict[str, Any]]) -> bool:
+            if stop_threshold is None or name in INCONCLUSIVE_STRATEGIES:
+                return False
+            return any(
+                c.get("origin") and c.get("confidence", 0.0) >= stop_threshold + STOP_MARGIN
+                for c in candidates
+            )
+        
+        # Package metadata is local and cheap; when it already identifies the
+        # source, the hashing and network strategies are unnecessary
+        if selected and selected[0] == "metadata":
+            candidates = await self._run_strategy(
+                "metadata", available_strategies["metadata"], path, max_depth
+            )
+            self._record_candidates(gathered, "metadata", candidates)
+            selected = [] if reaches_stop("metadata", candidates) else selected[1:]
+        
+        # The remaining strategies query independent backends, so run them
+        # concurrently; once one of them is conclusive the others are cancelled
+        tasks = {
+            asyncio.ensure_future(
+                self._run_strategy(name, available_strategies[name], path, max_depth)
+            ): name
+            for name in selected
+        }
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
             
-            try:
-                if self.verbose:
-                    console.print(f"[cyan]Running {strategy_name} strategy...[/cyan]")
-                
-                candidates = await strategy_func(path, max_depth)
-                
-                if candidates:
-                    all_candidates.extend(candidates)
-                    results["strategies_used"].append(strategy_name)
-                    
-                    if self.verbose:
-                        console.print(f"[green]✓ {strategy_name} found {len(candidates)} candidates[/green]")
-                        
-            except Exception as e:
-                if self.verbose:
-                    console.print(f"[yellow]⚠ {strategy_name} failed: {e}[/yellow]")
+            if any(reaches_stop(tasks[task], results[tasks[task]]) for task in done):
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                if self.verbose and pending:
+                    skipped = ", ".join(tasks[task] for task in pending)
+                    console.print(f"[dim]Skipped {skipped} after a conclusive match[/dim]")
+                break
+        
+        # Record results in the configured order, whatever order they finished in
+        for strategy_name in selected:
+            if strategy_name in results:
+                self._record_candidates(gathered, strategy_name, results[strategy_name])
         
         # Clean up any open sessions
         if hasattr(self, 'search_registry') and self.search_registry:
             await self.search_registry.close_all()
         
+        return gathered
+    
+    async def _run_strategy(
+        self,
+        strategy_name: str,
+        strategy_func: Callable[[Path, int], Awaitable[List[Dict[str, Any]]]],
+        path: Path,
+        max_depth: int
+    ) -> List[Dict[str, Any]]:
+        """Run one strategy, reporting failures instead of raising them.
+        
+        Args:
+            strategy_name: Name of the strategy, for progress output
+            strategy_func: Strategy coroutine function
+            path: Path to analyze
+            max_depth: Maximum depth for recursive scanning
+            
+        Returns:
+            The strategy's candidates, or an empty list if it failed
+        """
+        try:
+            if self.verbose:
+                console.print(f"[cyan]Running {strategy_name} strategy...[/cyan]")
+            
+            return await strategy_func(path, max_depth) or []
+        
+        except Exception as e:
+            if self.verbose:
+                console.print(f"[yellow]⚠ {strategy_name} failed: {e}[/yellow]")
+            return []
+    
+    def _record_candidates(
+        self,
+        gathered: Dict[str, Any],
+        strategy_name: str,
+        candidates: List[Dict[str, Any]]
+    ):
+        """Add a strategy's candidates to the gathered results."""
+        if not candidates:
+            return
+        
+        gathered["candidates"].extend(candidates)
+        gathered["strategies_used"].append(strategy_name)
+        
+        if self.verbose:
+            console.print(f"[green]✓ {strategy_name} found {len(candidates)} candidates[/green]")
+    
+    @staticmethod
+    def apply_threshold(
+        gathered: Dict[str, Any],
+        confidence_threshold: float = 0.5
+    ) -> Dict[str, Any]:
+        """Aggregate gathered candidates and apply a confidence threshold.
+        
+        Args:
+            gathered: Result of gather_candidates
+            confidence_threshold: Minimum confidence for identification
+            
+        Returns:
+            Dictionary with identification results
+        """
+        results = {
+            "path": gathered["path"],
+            "identified": False,
+            "confidence": 0.0,
+            "strategies_used": list(gathered["strategies_used"]),
+            "candidates": [],
+            "final_origin": None
+        }
+        all_candidates = gathered["candidates"]
+        
         # Aggregate and score candidates
         if all_candidates:
             origin_scores = Counter()
@@ -138,6 +325,87 @@ class SourceIdentifier:
         
         return results
     
+    async def _identify_via_metadata(
+        self,
+        path: Path,
+        max_depth: int
+    ) -> List[Dict[str, Any]]:
+        """Identify using package manifests at the root of the path."""
+        matches = await asyncio.to_thread(self._extract_manifest_matches, path)
+        
+        candidates = []
+        for match in matches:
+            # Only a declared repository is an origin; the registry page the
+            # parser falls back to says nothing about where the source lives
+            origin = self._declared_repository(match)
+            if not origin:
+                continue
+            
+            # Score by how completely the manifest describes the package
+            confidence = 0.3
+            if match.version:
+                confidence += 0.2
+            if match.author:
+                confidence += 0.2
+            if match.homepage:
+                confidence += 0.2
+            
+            candidates.append({
+                "source": "metadata",
+                "name": match.name,
+                "version": match.version,
+                "purl": match.purl,
+                "origin": origin,
+                "confidence": round(confidence, 2)
+            })
+        
+        # Several manifests usually describe the same package; keep the best
+        best = max(candidates, key=lambda c: c["confidence"], default=None)
+        return [best] if best else []
+    
+    def _declared_repository(self, match: PackageMatch) -> Optional[str]:
+        """Return the repository URL a manifest declares, if any.
+        
+        Homepages only count when they are hosted on a known Git host.
+        """
+        declared = [(match.repository_url, False), (match.homepage, True)]
+        for url, needs_git_host in declared:
+            if not isinstance(url, str):
+                continue
+            # npm style "git+https://host/repo.git" and "git://host/repo"
+            url = url.strip()
+            if url.startswith("git+"):
+                url = url[len("git+"):]
+            if url.startswith("git://"):
+                url = "https://" + url[len("git://"):]
+            
+            parsed = urlparse(url)
+            if parsed.scheme not in ("http", "https") or not parsed.hostname:
+                continue
+            if needs_git_host and not self._is_trusted_git_host(url):
+                continue
+            
+            repo_path = parsed.path.rstrip("/")
+            if repo_path.endswith(".git"):
+                repo_path = repo_path[:-len(".git")]
+            return f"{parsed.scheme}://{parsed.netloc}{repo_path}"
+        
+        return None
+    
+    def _extract_manifest_matches(self, path: Path) -> List[PackageMatch]:
+        """Parse the supported top-level manifests of a directory."""
+        parser = DirectManifestParser()
+        matches = []
+        
+        for name in METADATA_FILES:
+            manifest = path / name
+            if manifest.is_file():
+                match = parser.extract_metadata_from_file(manifest)
+                if match and match.name:
+                    matches.append(match)
+        
+        return matches
+    
     async def _identify_via_swh(
         self,
         path: Path,
@@ -148,16 +416,20 @@ class SourceIdentifier:
         
         # Lazily create SWH client only when needed
         if self.swh_client is None:
-            from ..core.config import SWHPIConfig
             config = SWHPIConfig(verbose=self.verbose)
             self.swh_client = SoftwareHeritageClient(config)
         
         # Scan directory
-        from ..core.config import SWHPIConfig
+        # Imported here: without swh.model the swhid module warns on import,
+        # which should not happen for runs that never hash anything
         from ..core.swhid import SWHIDGenerator
         config = SWHPIConfig(verbose=self.verbose, max_depth=max_depth)
         scanner = DirectoryScanner(config, SWHIDGenerator())
-        dir_candidates, file_candidates = scanner.scan_recursive(path)
+        
+        # Only the first 100 SWHIDs are checked: the most specific directories
+        # come first, so the whole tree is scanned before truncating. The
+        # scan runs in a worker thread so the event loop stays responsive.
+        dir_candidates, file_candidates = await asyncio.to_thread(scanner.scan_recursive, path)
         
         # Check SWHIDs
         all_swhids = [c.swhid for c in dir_candidates] + [c.swhid for c in file_candidates]
@@ -188,15 +460,14 @@ class SourceIdentifier:
         candidates = []
         
         # Scan for hashes
-        from ..core.config import SWHPIConfig
         from ..core.swhid import SWHIDGenerator
         config = SWHPIConfig(verbose=self.verbose, max_depth=1)
         scanner = DirectoryScanner(config, SWHIDGenerator())
-        dir_candidates, _ = scanner.scan_recursive(path)
+        dir_batch, _ = await asyncio.to_thread(scanner.scan_recursive_batches, path)
         
-        if dir_candidates:
+        if dir_batch:
             # Extract hash from SWHID
-            swhid = dir_candidates[0].swhid
+            swhid = dir_batch.swhids[0]
             hash_value = swhid.split(":")[-1] if ":" in swhid else swhid
             
             # Search for hash
@@ -220,45 +491,61 @@ class SourceIdentifier:
         """Identify using SCANOSS fingerprinting."""
         candidates = []
         
-        # Initialize SCANOSS provider
-        scanoss = SCANOSSProvider(verbose=self.verbose)
+        # Use the registry's SCANOSS provider so requests share its connection
+        # pool; a standalone provider is only needed if none is registered
+        scanoss = self.search_registry.get_provider("scanoss")
+        owns_provider = scanoss is None
+        if owns_provider:
+            scanoss = SCANOSSProvider(verbose=self.verbose)
         
         try:
             await scanoss.ensure_session()
             
-            # Use scan_file for individual files as scan_directory is not available
-            # in the consolidated provider
-            test_files = list(path.glob("**/*.c"))[:2] + list(path.glob("**/*.md"))[:1]
+            # Fingerprint a small sample of files as scan_directory is not
+            # available in the consolidated provider
+            samples = await asyncio.to_thread(_first_of_each, path, {'.c': 2, '.md': 1})
+            test_files = samples['.c'] + samples['.md']
             
             if not test_files:
                 test_files = list(path.iterdir())[:3]
             
-            for test_file in test_files:
-                if test_file.is_file():
+            test_files = [f for f in test_files if f.is_file()]
+            
+            # Submit all fingerprints in one request; fall back to per-file
+            # scans only if the batch request fails
+            scan_results = await scanoss.scan_files(test_files)
+            if not scan_results:
+                scan_results = {}
+                for test_file in test_files:
                     result = await scanoss.scan_file(test_file)
-                    # Parse SCANOSS results if available
                     if result and isinstance(result, dict):
-                        for file_name, file_data in result.items():
-                            if isinstance(file_data, list):
-                                for match in file_data:
-                                    if isinstance(match, dict) and match.get("component"):
-                                        url = match.get("url", "")
-                                        if self._is_trusted_git_host(url):
-                                            # Ensure matched is numeric
-                                            matched_val = match.get("matched", 0)
-                                            if isinstance(matched_val, str):
-                                                try:
-                                                    matched_val = float(matched_val)
-                                                except (ValueError, TypeError):
-                                                    matched_val = 0
-                                            candidates.append({
-                                                "source": "scanoss",
-                                                "component": match.get("component", ""),
-                                                "origin": url,
-                                                "confidence": matched_val / 100.0 if matched_val else 0.5
-                                            })
+                        scan_results.update(result)
+            
+            # Parse SCANOSS results if available
+            for file_name, file_data in scan_results.items():
+                if isinstance(file_data, list):
+                    for match in file_data:
+                        if isinstance(match, dict) and match.get("component"):
+                            url = match.get("url", "")
+                            if self._is_trusted_git_host(url):
+                                # Ensure matched is numeric
+                                matched_val = match.get("matched", 0)
+                                if isinstance(matched_val, str):
+                                    try:
+                                        matched_val = float(matched_val)
+                                    except (ValueError, TypeError):
+                                        matched_val = 0
+                                candidates.append({
+                                    "source": "scanoss",
+                                    "component": match.get("component", ""),
+                                    "origin": url,
+                                    "confidence": matched_val / 100.0 if matched_val else 0.5
+                                })
         finally:
-            await scanoss.close()
+            # Other strategies may still be using the registry's provider;
+            # its session is released by search_registry.close_all()
+            if owns_provider:
+                await scanoss.close()
         
         return candidates
 
@@ -272,7 +559,6 @@ class SourceIdentifier:
             return False
 
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(url)
 
             # Check if hostname exactly matches or is a subdomain of trusted hosts
@@ -356,7 +642,8 @@ async def identify_source(
     confidence_threshold: float = 0.5,
     verbose: bool = False,
     strategies: Optional[List[str]] = None,
-    use_swh: bool = False
+    use_swh: bool = False,
+    exhaustive: bool = False
 ) -> Dict[str, Any]:
     """Convenience function for source identification.
     
@@ -367,6 +654,7 @@ async def identify_source(
         verbose: Enable verbose output
         strategies: List of strategies to use
         use_swh: Whether to include Software Heritage checking
+        exhaustive: Run every strategy even after a conclusive match
         
     Returns:
         Identification results
@@ -378,7 +666,8 @@ async def identify_source(
             max_depth=max_depth,
             confidence_threshold=confidence_threshold,
             strategies=strategies,
-            use_swh=use_swh
+            use_swh=use_swh,
+            exhaustive=exhaustive
         )
         
         if verbose:
@@ -3,6 +3,13 @@
 from datetime import datetime
 from typing import Any, Optional
 
+# Formats tried when fromisoformat cannot parse a string
+_FALLBACK_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+)
+
 
 def parse_datetime(date_str: Any) -> Optional[datetime]:
     """
@@ -27,23 +34,24 @@ def parse_datetime(date_str: Any) -> Optional[datetime]:
             return None
     
     if isinstance(date_str, str):
-        # Try ISO format first (most common)
+        # Every supported format starts with the year, so anything else can
+        # be rejected without trying the parsers
+        if not date_str[:1].isdigit():
+            return None
+        
+        # Try ISO format first (most common); fromisoformat only accepts
+        # the Z suffix natively from Python 3.11
+        iso_str = date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str
         try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            return datetime.fromisoformat(iso_str)
         except ValueError:
             pass
         
         # Try other common formats
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d",
-        ]
-        
-        for fmt in formats:
+        for fmt in _FALLBACK_FORMATS:
             try:
                 return datetime.strptime(date_str, fmt)
             except ValueError:
                 continue
     
-    return None
\ No newline at end of file
+    return None
@@ -1,7 +1,166 @@
 """Pytest configuration for src2purl."""
 
+import asyncio
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
+import pytest
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Shared-memory filesystem used for test files when it is available
+SHARED_MEM_FS = "/dev/shm"
+
+# (previous tempfile.tempdir, per-run directory) while tests run on tmpfs
+_tmpfs_state = None
+
+
+def pytest_configure(config):
+    """Put tmp_path and tempfile directories on tmpfs when it is writable.
+    
+    The tests create many small trees; on tmpfs that is a memory copy with
+    no journal or writeback. Each run gets its own directory, created by
+    and owned by the current user, so runs by other users cannot collide.
+    An explicit --basetemp or PYTEST_DEBUG_TEMPROOT still wins.
+    """
+    global _tmpfs_state
+    
+    if config.option.basetemp or os.environ.get("PYTEST_DEBUG_TEMPROOT"):
+        return
+    if not (hasattr(os, "getuid") and os.path.isdir(SHARED_MEM_FS)
+            and os.access(SHARED_MEM_FS, os.W_OK)):
+        return
+    
+    try:
+        temp_root = tempfile.mkdtemp(prefix=f"src2id-tests-{os.getuid()}-", dir=SHARED_MEM_FS)
+        if os.lstat(temp_root).st_uid != os.getuid():
+            return
+    except OSError:
+        return
+    
+    # Only this process's tempfile default changes; TMPDIR is left alone
+    _tmpfs_state = (tempfile.tempdir, temp_root)
+    tempfile.tempdir = temp_root
+
+
+def pytest_unconfigure(config):
+    """Restore tempfile's directory and remove this run's tmpfs directory."""
+    global _tmpfs_state
+    
+    if _tmpfs_state is None:
+        return
+    
+    tempdir, temp_root = _tmpfs_state
+    tempfile.tempdir = tempdir
+    shutil.rmtree(temp_root, ignore_errors=True)
+    _tmpfs_state = None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _uvloop_policy():
+    """Run the async tests on uvloop when it is installed."""
+    if uvloop is None:
+        yield asyncio.get_event_loop_policy()
+        return
+    
+    original = asyncio.get_event_loop_policy()
+    policy = uvloop.EventLoopPolicy()
+    asyncio.set_event_loop_policy(policy)
+    yield policy
+    asyncio.set_event_loop_policy(original)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_cache_dir(tmp_path_factory):
+    """Keep persistent caches created by tests out of the user's cache directory."""
+    cache_dir = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("SRC2PURL_CACHE_DIR", str(cache_dir))
+        yield cache_dir
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _no_official_swh_client():
+    """Use the built-in HTTP client even when swh.web is installed.
+    
+    Tests covering the official WebAPIClient opt back in with their own patch.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src2id.core.client.SWH_CLIENT_AVAILABLE", False)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_caches(_isolated_cache_dir):
+    """Drop cache entries written by a test so they cannot leak into the next one."""
+    from src2id.core.purl import _generate_purl_cached
+    from src2id.core.scorer import ConfidenceScorer
+    
+    yield
+    _generate_purl_cached.cache_clear()
+    ConfidenceScorer._combine_scores.cache_clear()
+    for entry in _isolated_cache_dir.iterdir():
+        if entry.is_dir():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+
+
+@pytest.fixture(scope="session")
+def swhid_gen():
+    """Share one SWHID generator across tests; it only caches by inode and mtime."""
+    from src2id.core.swhid import SWHIDGenerator
+    
+    return SWHIDGenerator()
+
+
+@pytest.fixture(scope="session")
+def fallback_swhid_gen():
+    """Share one SWHID generator that always uses the built-in git hashing."""
+    from src2id.core.swhid import SWHIDGenerator
+    
+    return SWHIDGenerator(use_swh_model=False)
+
+
+def _materialize(root, tree):
+    """Write a {relative path: str or bytes} tree under root in a single pass."""
+    created_dirs = set()
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    for rel, content in tree.items():
+        file_path = os.path.join(root, rel)
+        parent = os.path.dirname(file_path)
+        if parent not in created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            created_dirs.add(parent)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        fd = os.open(file_path, flags, 0o644)
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+    return root
+
+
+@pytest.fixture(scope="session")
+def materialize_tree():
+    """Return the helper that writes a {relative path: content} tree under a root."""
+    return _materialize
+
+
+@pytest.fixture
+def write_tree(tmp_path):
+    """Return a helper that writes a {relative path: content} tree under tmp_path."""
+    def write(tree):
+        return _materialize(tmp_path, tree)
+    
+    return write
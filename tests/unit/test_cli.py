@@ -0,0 +1,78 @@
+"""Unit tests for CLI output."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src2id.cli import main as cli_main
+from src2id.cli.main import output_json
+from src2id.core.config import SWHPIConfig
+from src2id.core.models import MatchType, PackageMatch
+
+
+def test_cli_json_output(capsys):
+    """Test that JSON output exposes matches, count and threshold."""
+    config = SWHPIConfig(report_match_threshold=0.3)
+    matches = [
+        PackageMatch(
+            download_url="https://github.com/owner/repo",
+            match_type=MatchType.EXACT,
+            confidence_score=0.91234,
+            name="repo",
+            purl="pkg:github/owner/repo",
+        )
+    ]
+    
+    output_json(matches, config)
+    output = json.loads(capsys.readouterr().out)
+    
+    assert output["count"] == 1
+    assert output["threshold"] == 0.3
+    assert output["matches"][0]["confidence"] == 0.912
+    assert output["matches"][0]["type"] == "exact"
+    assert output["matches"][0]["purl"] == "pkg:github/owner/repo"
+
+
+def test_cli_json_output_stdlib_fallback(capsys):
+    """Test that JSON output falls back to the stdlib encoder without orjson."""
+    config = SWHPIConfig(report_match_threshold=0.5)
+    
+    with patch.object(cli_main, "ORJSON_AVAILABLE", False):
+        output_json([], config)
+    
+    output = json.loads(capsys.readouterr().out)
+    assert output == {"matches": [], "count": 0, "threshold": 0.5}
+
+
+def test_cli_json_output_same_with_either_encoder(capsys):
+    """Test that orjson and the stdlib encoder write identical output."""
+    pytest.importorskip("orjson")
+    config = SWHPIConfig(report_match_threshold=0.5)
+    matches = [
+        PackageMatch(
+            download_url="https://github.com/owner/café",
+            match_type=MatchType.EXACT,
+            confidence_score=0.9,
+            name="café",
+        )
+    ]
+    
+    output_json(matches, config)
+    with_orjson = capsys.readouterr().out
+    with patch.object(cli_main, "ORJSON_AVAILABLE", False):
+        output_json(matches, config)
+    
+    assert capsys.readouterr().out == with_orjson
+    assert "café" in with_orjson
+
+
+def test_cli_import_does_not_warn():
+    """Test that loading the CLI does not import the SWHID backends."""
+    # A fresh interpreter, since this one has already imported the swhid module
+    subprocess.run(
+        [sys.executable, "-W", "error", "-c", "import src2id.cli.main"],
+        check=True,
+    )
@@ -1,30 +1,76 @@
 """Unit tests for the Software Heritage API client."""
 
+import asyncio
 import json
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
+from src2id.core.cache import PersistentCache
 from src2id.core.client import SoftwareHeritageClient
 from src2id.core.config import SWHPIConfig
 
 
-class TestSoftwareHeritageClient:
-    """Test suite for SoftwareHeritageClient class."""
+async def _with_api(routes, test, **config_overrides):
+    """Run test(client) against a local server answering the given routes.
+    
+    Args:
+        routes: (method, path, handler) tuples served under the API base
+        test: Coroutine function receiving a started client
+        **config_overrides: Extra SWHPIConfig fields
+        
+    Returns:
+        Whatever test returns
+    """
+    app = web.Application()
+    for method, path, handler in routes:
+        app.router.add_route(method, path, handler)
     
-    @pytest.fixture
-    def config(self):
-        """Create test configuration."""
-        return SWHPIConfig(
+    async with TestServer(app) as server:
+        config = SWHPIConfig(
             verbose=False,
             cache_enabled=False,
-            api_token="test_token"
+            rate_limit_delay=0,
+            sh_api_base=str(server.make_url("")).rstrip("/"),
+            **config_overrides
         )
+        async with SoftwareHeritageClient(config) as client:
+            return await test(client)
+
+
+@pytest.fixture(scope="class")
+def official_web_client():
+    """Make the official WebAPIClient available for a whole test class."""
+    with patch('src2id.core.client.SWH_CLIENT_AVAILABLE', True), \
+         patch('src2id.core.client.WebAPIClient') as MockWebClient:
+        MockWebClient.return_value = Mock()
+        yield MockWebClient
+
+
+@pytest.fixture(scope="class")
+def config():
+    """Create test configuration."""
+    return SWHPIConfig(
+        verbose=False,
+        cache_enabled=False,
+        api_token="test_token"
+    )
+
+
+@pytest.fixture(scope="class")
+def client(config):
+    """Create client instance shared by the tests of this class.
     
-    @pytest.fixture
-    def client(self, config):
-        """Create client instance."""
-        return SoftwareHeritageClient(config)
+    Tests that change client state do so through monkeypatch so it is
+    restored afterwards.
+    """
+    return SoftwareHeritageClient(config)
+
+
+class TestSoftwareHeritageClient:
+    """Test suite for SoftwareHeritageClient class."""
     
     def test_client_initialization(self, config):
         """Test client is properly initialized."""
@@ -35,73 +81,313 @@ class TestSoftwareHeritageClient:
     
     def test_session_management(self, client):
         """Test session creation and cleanup."""
-        # Session management is async, just test initialization
         assert client.session is None
         assert client.config.api_token == "test_token"
+        
+        async def run():
+            await client.start_session()
+            session = client.session
+            connector = session.connector
+            await client.close_session()
+            return session, connector
+        
+        session, connector = asyncio.run(run())
+        
+        # Connections are pooled and reused across requests
+        assert connector.limit_per_host == 10
+        assert session.closed
+        assert client.session is None
     
-    def test_context_manager(self, client):
-        """Test context manager setup."""
-        # Context manager is async, just verify client has the methods
-        assert hasattr(client, '__aenter__')
-        assert hasattr(client, '__aexit__')
+    def test_context_manager(self, config):
+        """Test that the context manager opens and closes the session."""
+        client = SoftwareHeritageClient(config)
+        
+        async def run():
+            async with client as entered:
+                assert entered is client
+                session = client.session
+                assert session is not None and not session.closed
+            return session
+        
+        session = asyncio.run(run())
+        
+        assert session.closed
+        assert client.session is None
     
-    def test_check_swhids_known(self, client):
-        """Test checking if SWHIDs are known."""
-        # This is an async method, just verify it exists
-        assert hasattr(client, 'check_swhids_known')
+    def test_check_swhids_known(self):
+        """Test checking SWHIDs against the /known/ endpoint."""
+        swhids = ["swh:1:cnt:" + "0" * 40, "swh:1:dir:" + "1" * 40]
+        
+        async def known(request):
+            body = await request.json()
+            return web.json_response({
+                swhid: {"known": swhid.startswith("swh:1:cnt:")} for swhid in body
+            })
+        
+        result = asyncio.run(_with_api(
+            [("POST", "/known/", known)],
+            lambda client: client.check_swhids_known(swhids)
+        ))
+        
+        assert result == {swhids[0]: True, swhids[1]: False}
     
-    def test_check_swhids_batch(self, client):
+    def test_check_swhids_batch(self, client, monkeypatch):
         """Test batch SWHID checking logic."""
-        # Verify the client can handle large batches
-        assert hasattr(client, 'check_swhids_known')
-        # Batch size is typically 1000
-        assert client.config is not None
+        swhids = [f"swh:1:cnt:{i:040x}" for i in range(1500)]
+        batches = []
+        
+        async def fake_batch(batch):
+            batches.append(batch)
+            return {swhid: True for swhid in batch}
+        
+        async def run():
+            monkeypatch.setattr(client, "session", Mock())
+            with patch.object(client, '_post_known_batch', side_effect=fake_batch):
+                return await client.check_swhids_known(swhids)
+        
+        result = asyncio.run(run())
+        
+        # Large inputs are split into batches of 1000
+        assert [len(batch) for batch in batches] == [1000, 500]
+        assert len(result) == 1500
+        assert all(result.values())
     
-    def test_search_origins_by_keyword(self, client):
+    def test_check_swhids_batch_fallback(self, client, monkeypatch):
+        """Test that a failed batch falls back to individual requests."""
+        swhids = ["swh:1:dir:" + "0" * 40, "swh:1:dir:" + "1" * 40]
+        
+        async def fake_known(swhid):
+            return swhid == swhids[0]
+        
+        async def run():
+            monkeypatch.setattr(client, "session", Mock())
+            with patch.object(client, '_post_known_batch', return_value=None), \
+                 patch.object(client, '_is_directory_known', side_effect=fake_known):
+                return await client.check_swhids_known(swhids)
+        
+        result = asyncio.run(run())
+        
+        assert result == {swhids[0]: True, swhids[1]: False}
+    
+    def test_failed_known_check_not_cached(self, tmp_path):
+        """Test that an archive outage is not cached as "not archived"."""
+        swhid = "swh:1:dir:" + "0" * 40
+        available = False
+        
+        async def known(request):
+            if not available:
+                raise web.HTTPServiceUnavailable()
+            return web.json_response({swhid: {"known": True}})
+        
+        async def directory(request):
+            raise web.HTTPServiceUnavailable()
+        
+        async def check(client):
+            nonlocal available
+            client.cache = PersistentCache(cache_dir=tmp_path)
+            during_outage = await client.check_swhids_known([swhid])
+            available = True
+            return during_outage, await client.check_swhids_known([swhid])
+        
+        during_outage, after_outage = asyncio.run(_with_api(
+            [("POST", "/known/", known), ("GET", "/directory/{hash}/", directory)],
+            check
+        ))
+        
+        assert during_outage == {swhid: False}
+        assert after_outage == {swhid: True}
+        # Only the definitive answer reached the persistent cache
+        assert PersistentCache(cache_dir=tmp_path).get(f"known:{swhid}").data is True
+    
+    def test_post_known_batch_body(self, client, monkeypatch):
+        """Test that the /known/ request body is sent as pre-encoded JSON."""
+        swhids = ["swh:1:cnt:" + "0" * 40, "swh:1:cnt:" + "1" * 40]
+        response = Mock(status=200)
+        response.json = AsyncMock(return_value={swhids[0]: {"known": True}})
+        
+        context = Mock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=False)
+        
+        monkeypatch.setattr(client, "session", Mock())
+        client.session.post = Mock(return_value=context)
+        monkeypatch.setattr(client.config, "rate_limit_delay", 0)
+        
+        result = asyncio.run(client._post_known_batch(swhids))
+        
+        kwargs = client.session.post.call_args.kwargs
+        assert json.loads(kwargs["data"]) == swhids
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+        assert result == {swhids[0]: True, swhids[1]: False}
+    
+    def test_search_origins_by_keyword(self):
         """Test searching origins by keyword."""
-        # Verify method exists
-        assert hasattr(client, 'search_origins_by_keyword')
+        async def search(request):
+            assert request.match_info["keyword"] == "darktable"
+            return web.json_response([{"url": "https://github.com/darktable-org/darktable"}])
+        
+        result = asyncio.run(_with_api(
+            [("GET", "/origin/search/{keyword}/", search)],
+            lambda client: client.search_origins_by_keyword("darktable")
+        ))
+        
+        assert result == [{"url": "https://github.com/darktable-org/darktable"}]
     
     def test_get_origin_for_swhid(self, client):
         """Test getting origin for a SWHID."""
-        # This method doesn't exist in current implementation
-        # Just verify client is initialized properly
-        assert client.config is not None
-    
-    def test_rate_limiting(self, client):
-        """Test rate limiting behavior."""
-        # Verify rate limiter exists
-        assert hasattr(client, '_rate_limiter')
-    
-    def test_error_handling_404(self, client):
-        """Test handling of 404 errors."""
-        # Verify client has session management for error handling
-        assert hasattr(client, 'session')
-    
-    def test_error_handling_timeout(self, client):
-        """Test handling of timeout errors."""
-        # Timeout handling is built into aiohttp
-        assert client.config is not None
-    
-    def test_cache_usage(self):
+        origins = [{"url": "https://github.com/owner/repo"}]
+        
+        with patch.object(client, '_get_directory_origins_data', return_value=origins):
+            origin = asyncio.run(client.get_origin_for_swhid("swh:1:dir:" + "0" * 40))
+        
+        assert origin == "https://github.com/owner/repo"
+    
+    def test_known_status_cached_per_swhid(self, client, tmp_path, monkeypatch):
+        """Test that known status is cached and only missing SWHIDs are queried."""
+        monkeypatch.setattr(client, "cache", PersistentCache(cache_dir=tmp_path))
+        swhids = ["swh:1:cnt:" + "0" * 40, "swh:1:cnt:" + "1" * 40]
+        queried = []
+        
+        async def fake_fetch(batch):
+            queried.append(list(batch))
+            return {swhid: swhid == swhids[0] for swhid in batch}
+        
+        with patch.object(client, '_fetch_swhids_known', side_effect=fake_fetch):
+            first = asyncio.run(client.check_swhids_known(swhids[:1]))
+            second = asyncio.run(client.check_swhids_known(swhids))
+            third = asyncio.run(client.check_swhids_known(swhids))
+        
+        assert first == {swhids[0]: True}
+        assert second == {swhids[0]: True, swhids[1]: False}
+        assert third == second
+        # Negative results are cached as well
+        assert queried == [swhids[:1], swhids[1:]]
+    
+    def test_rate_limiting(self, client, monkeypatch):
+        """Test that many SWHIDs are checked with a single batched request."""
+        swhids = [f"swh:1:cnt:{i:040x}" for i in range(10)]
+        
+        async def run():
+            monkeypatch.setattr(client, "session", Mock())
+            with patch.object(
+                client, '_post_known_batch',
+                side_effect=lambda batch: {swhid: True for swhid in batch}
+            ) as mock_request:
+                result = await client.check_swhids_known(swhids)
+            return result, mock_request
+        
+        result, mock_request = asyncio.run(run())
+        
+        assert mock_request.call_count == 1
+        assert len(result) == 10
+    
+    def test_rate_limit_semaphore(self, config, monkeypatch):
+        """Test that concurrent /known/ requests are bounded by the rate limiter."""
+        swhids = [f"swh:1:cnt:{i:040x}" for i in range(10)]
+        active = 0
+        peak = 0
+        
+        class FakeRequest:
+            async def __aenter__(self):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                response = Mock(status=200)
+                response.json = AsyncMock(return_value={})
+                return response
+            
+            async def __aexit__(self, *args):
+                nonlocal active
+                active -= 1
+                return False
+        
+        # The semaphore binds to the event loop it first blocks in, so use a
+        # dedicated client rather than the shared one
+        client = SoftwareHeritageClient(config)
+        monkeypatch.setattr(config, "rate_limit_delay", 0)
+        client.session = Mock()
+        client.session.post = Mock(side_effect=lambda *args, **kwargs: FakeRequest())
+        
+        # One SWHID per batch so every SWHID is its own concurrent request
+        with patch.object(client, 'KNOWN_BATCH_SIZE', 1):
+            result = asyncio.run(client._fetch_swhids_known(swhids))
+        
+        assert client.session.post.call_count == 10
+        assert peak == 5
+        assert result == {swhid: False for swhid in swhids}
+    
+    def test_error_handling_404(self):
+        """Test that a 404 response yields no data."""
+        async def not_found(request):
+            raise web.HTTPNotFound()
+        
+        result = asyncio.run(_with_api(
+            [("GET", "/directory/{hash}/", not_found)],
+            lambda client: client._get_directory_info("swh:1:dir:" + "0" * 40)
+        ))
+        
+        assert result is None
+    
+    def test_error_handling_timeout(self, capsys):
+        """Test that a request timing out yields no data."""
+        async def slow(request):
+            await asyncio.sleep(1)
+            return web.json_response({})
+        
+        result = asyncio.run(_with_api(
+            [("GET", "/directory/{hash}/", slow)],
+            lambda client: client._get_directory_info("swh:1:dir:" + "0" * 40),
+            request_timeout=0.05
+        ))
+        
+        assert result is None
+        assert "Request timeout" in capsys.readouterr().out
+    
+    def test_cache_usage(self, tmp_path, monkeypatch):
         """Test that cache is used when enabled."""
+        monkeypatch.setenv("SRC2PURL_CACHE_DIR", str(tmp_path))
         config = SWHPIConfig(cache_enabled=True, verbose=False)
         client = SoftwareHeritageClient(config)
         
         assert client.cache is not None
+        assert client.cache.cache_dir == tmp_path
         assert hasattr(client.cache, 'get')
         assert hasattr(client.cache, 'set')
+
+
+class TestOfficialWebClient:
+    """Tests for the client when the official swh.web client is installed."""
     
-    def test_official_client_usage(self):
+    def test_official_client_usage(self, official_web_client):
         """Test using official WebAPIClient when available."""
-        config = SWHPIConfig(verbose=False)
-        
-        # Mock the swh.web module
-        with patch('src2id.core.client.SWH_CLIENT_AVAILABLE', True):
-            with patch('src2id.core.client.WebAPIClient') as MockWebClient:
-                mock_client = Mock()
-                MockWebClient.return_value = mock_client
-                
-                client = SoftwareHeritageClient(config)
-                assert client._use_official_client is True
-                assert client.web_client is not None
\ No newline at end of file
+        config = SWHPIConfig(verbose=False, cache_enabled=False)
+        
+        client = SoftwareHeritageClient(config)
+        assert client._use_official_client is True
+        assert client.web_client is official_web_client.return_value
+    
+    def test_official_client_token(self, official_web_client):
+        """Test that the API token is passed to the official client."""
+        config = SWHPIConfig(verbose=False, cache_enabled=False, api_token="secret")
+        
+        SoftwareHeritageClient(config)
+        
+        official_web_client.assert_called_with(
+            api_url=config.sh_api_base,
+            bearer_token="secret"
+        )
+    
+    def test_official_client_known(self, official_web_client):
+        """Test that known checks go through the official client."""
+        config = SWHPIConfig(verbose=False, cache_enabled=False)
+        swhids = ["swh:1:cnt:" + "0" * 40, "swh:1:cnt:" + "1" * 40]
+        official_web_client.return_value.known.return_value = {
+            swhids[0]: {"known": True},
+            swhids[1]: {"known": False},
+        }
+        
+        client = SoftwareHeritageClient(config)
+        result = asyncio.run(client.check_swhids_known(swhids))
+        
+        assert result == {swhids[0]: True, swhids[1]: False}
@@ -9,9 +9,39 @@ from src2id.utils.datetime_utils import parse_datetime
 class TestParseDatetime:
     """Test datetime parsing functionality."""
     
-    def test_parse_none(self):
-        """Test parsing None returns None."""
-        assert parse_datetime(None) is None
+    @pytest.mark.parametrize("value, expected_attrs", [
+        pytest.param(None, None, id="none"),
+        pytest.param(1609459200.5, {}, id="float-timestamp"),
+        pytest.param("2021-01-01T12:00:00", {"year": 2021, "hour": 12}, id="iso-format"),
+        pytest.param("2021-01-01T12:00:00Z", {"year": 2021}, id="iso-with-z"),
+        pytest.param("2021-01-01", {"year": 2021, "month": 1, "day": 1}, id="date-only"),
+        pytest.param(
+            "2021-01-01 12:30:45",
+            {"hour": 12, "minute": 30, "second": 45},
+            id="space-separator"
+        ),
+        pytest.param(
+            "2019-05-23T10:52:36.148000+00:00",
+            {"year": 2019, "microsecond": 148000},
+            id="iso-with-offset"
+        ),
+        pytest.param("not a date", None, id="invalid-string"),
+        pytest.param("2021-13-45", None, id="invalid-date"),
+        pytest.param("", None, id="empty-string"),
+        pytest.param([], None, id="invalid-list"),
+        pytest.param({}, None, id="invalid-dict"),
+    ])
+    def test_parse_datetime(self, value, expected_attrs):
+        """Test parsing supported inputs and rejecting invalid ones."""
+        result = parse_datetime(value)
+        
+        if expected_attrs is None:
+            assert result is None
+            return
+        
+        assert result is not None
+        for attr, expected in expected_attrs.items():
+            assert getattr(result, attr) == expected
     
     def test_parse_datetime_object(self):
         """Test datetime object is returned as-is."""
@@ -25,51 +55,3 @@ class TestParseDatetime:
         assert result is not None
         # The year depends on timezone, just check it parsed
         assert result.year in [2020, 2021]
-    
-    def test_parse_float_timestamp(self):
-        """Test parsing float timestamp."""
-        timestamp = 1609459200.5
-        result = parse_datetime(timestamp)
-        assert result is not None
-    
-    def test_parse_iso_format(self):
-        """Test parsing ISO format string."""
-        iso_str = "2021-01-01T12:00:00"
-        result = parse_datetime(iso_str)
-        assert result is not None
-        assert result.year == 2021
-        assert result.hour == 12
-    
-    def test_parse_iso_with_z(self):
-        """Test parsing ISO format with Z timezone."""
-        iso_str = "2021-01-01T12:00:00Z"
-        result = parse_datetime(iso_str)
-        assert result is not None
-        assert result.year == 2021
-    
-    def test_parse_date_only(self):
-        """Test parsing date-only string."""
-        date_str = "2021-01-01"
-        result = parse_datetime(date_str)
-        assert result is not None
-        assert result.year == 2021
-        assert result.month == 1
-        assert result.day == 1
-    
-    def test_parse_datetime_with_space(self):
-        """Test parsing datetime with space separator."""
-        dt_str = "2021-01-01 12:30:45"
-        result = parse_datetime(dt_str)
-        assert result is not None
-        assert result.hour == 12
-        assert result.minute == 30
-        assert result.second == 45
-    
-    def test_parse_invalid_string(self):
-        """Test parsing invalid string returns None."""
-        assert parse_datetime("not a date") is None
-    
-    def test_parse_invalid_type(self):
-        """Test parsing invalid type returns None."""
-        assert parse_datetime([]) is None
-        assert parse_datetime({}) is None
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""Unit tests for hash-based search."""
+
+import asyncio
+
+import pytest
+
+from src2id.search.hash_search import HashSearcher
+
+
+class _StubRegistry:
+    """Search registry returning a fixed URL for every query."""
+    
+    def __init__(self):
+        self.queries = []
+    
+    async def search_all(self, query, **kwargs):
+        self.queries.append(query)
+        return {"stub": ["https://github.com/owner/repo"]}
+
+
+class TestHashSearcher:
+    """Test suite for HashSearcher class."""
+    
+    def test_search_files_concurrently(self, tmp_path):
+        """Test that every file is searched and results are keyed by path."""
+        registry = _StubRegistry()
+        searcher = HashSearcher(search_registry=registry)
+        
+        files = [tmp_path / "a.c", tmp_path / "b.md"]
+        files[0].write_text("int main(void) { return 0; }")
+        files[1].write_text("# Readme")
+        
+        results = asyncio.run(searcher.search_files(files))
+        
+        assert set(results) == set(files)
+        assert results[files[0]]["sha1_git"] == ["https://github.com/owner/repo"]
+        # Two hash types per file, three queries per hash
+        assert len(registry.queries) == 12
+    
+    def test_search_files_skips_missing(self, tmp_path):
+        """Test that missing files yield no results."""
+        searcher = HashSearcher(search_registry=_StubRegistry())
+        
+        results = asyncio.run(searcher.search_files([tmp_path / "missing.c"]))
+        
+        assert results == {}
+    
+    def test_identical_files_searched_once(self, tmp_path):
+        """Test that files with identical content share one search."""
+        registry = _StubRegistry()
+        searcher = HashSearcher(search_registry=registry)
+        
+        files = [tmp_path / "a.c", tmp_path / "vendor" / "a.c"]
+        files[1].parent.mkdir()
+        for path in files:
+            path.write_text("int main(void) { return 0; }")
+        
+        results = asyncio.run(searcher.search_files(files))
+        assert results[files[0]] == results[files[1]]
+        assert len(registry.queries) == 6
+        
+        # A later scan hits the cache without querying again
+        asyncio.run(searcher.search_file(files[0]))
+        assert len(registry.queries) == 6
+    
+    def test_cancelled_search_does_not_cancel_waiters(self):
+        """Test that a search waiting on a cancelled one searches again."""
+        registry = _StubRegistry()
+        searcher = HashSearcher(search_registry=registry)
+        hash_value = "a" * 40
+        
+        async def run():
+            first_started = asyncio.Event()
+            search_all = registry.search_all
+            
+            async def blocking_search_all(query, **kwargs):
+                if not first_started.is_set():
+                    first_started.set()
+                    await asyncio.sleep(10)
+                return await search_all(query, **kwargs)
+            
+            registry.search_all = blocking_search_all
+            first = asyncio.ensure_future(searcher.search_hash(hash_value))
+            await first_started.wait()
+            second = asyncio.ensure_future(searcher.search_hash(hash_value))
+            await asyncio.sleep(0)
+            
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await asyncio.wait_for(second, timeout=1)
+        
+        assert asyncio.run(run()) == ["https://github.com/owner/repo"]
@@ -0,0 +1,91 @@
+"""Unit tests for search providers."""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from src2id.search import providers
+from src2id.search.providers import (
+    GitHubSearchProvider,
+    SCANOSSProvider,
+    SearchProviderRegistry,
+)
+
+
+class TestSCANOSSProvider:
+    """Test suite for SCANOSSProvider class."""
+    
+    @pytest.fixture
+    def provider(self):
+        """Create provider instance."""
+        return SCANOSSProvider(verbose=False)
+    
+    def test_create_wfps_combines_files(self, provider, tmp_path):
+        """Test that batch WFP contains one block per readable file."""
+        (tmp_path / "a.c").write_text("int a;")
+        (tmp_path / "b.c").write_text("int b;")
+        
+        wfp = provider._create_wfps([
+            tmp_path / "a.c",
+            tmp_path / "b.c",
+            tmp_path / "missing.c",
+        ])
+        
+        assert wfp.count("file=") == 2
+        assert ",a.c\n" in wfp
+        assert ",b.c\n" in wfp
+    
+    def test_create_wfp_fingerprint(self, provider, tmp_path, monkeypatch):
+        """Test that the WFP carries the file's MD5, size and name."""
+        file_path = tmp_path / "main.c"
+        file_path.write_bytes(b"int main(void) { return 0; }\n")
+        expected = (
+            f"file={hashlib.md5(file_path.read_bytes()).hexdigest()},29,main.c\n"
+            "1=00000000"
+        )
+        
+        assert provider._create_wfp(file_path) == expected
+        
+        # Plain read path used where hashlib.file_digest is unavailable
+        monkeypatch.setattr(providers, "_file_digest", None)
+        assert provider._create_wfp(file_path) == expected
+    
+    def test_scan_files_empty(self, provider):
+        """Test that scanning no files does not open a session."""
+        assert asyncio.run(provider.scan_files([])) == {}
+        assert provider.session is None
+
+
+class TestSearchProviderRegistry:
+    """Test suite for SearchProviderRegistry class."""
+    
+    def test_providers_share_pooled_session(self):
+        """Test that registered providers reuse one pooled session."""
+        registry = SearchProviderRegistry()
+        github = GitHubSearchProvider()
+        scanoss = SCANOSSProvider()
+        registry.register_provider("github", github)
+        registry.register_provider("scanoss", scanoss)
+        
+        async def run():
+            await github.ensure_session()
+            await scanoss.ensure_session()
+            session = github.session
+            shared = scanoss.session is session
+            limit_per_host = session.connector.limit_per_host
+            
+            # Releasing one provider must not close the session for the other
+            await github.close()
+            still_open = not session.closed
+            
+            await registry.close_all()
+            return session, shared, limit_per_host, still_open
+        
+        session, shared, limit_per_host, still_open = asyncio.run(run())
+        
+        assert shared
+        assert limit_per_host == 20
+        assert still_open
+        assert session.closed
+        assert scanoss.session is None
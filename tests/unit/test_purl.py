@@ -2,17 +2,18 @@
 
 import pytest
 
-from src2id.core.purl import PURLGenerator
+from src2id.core.purl import PURLGenerator, _generate_purl_cached
+
+
+@pytest.fixture(scope="module")
+def generator():
+    """Create a PURL generator instance shared by the module."""
+    return PURLGenerator()
 
 
 class TestPURLGenerator:
     """Test PURL generation functionality."""
     
-    @pytest.fixture
-    def generator(self):
-        """Create a PURL generator instance."""
-        return PURLGenerator()
-    
     def test_github_purl_with_version(self, generator):
         """Test generating GitHub PURL with version."""
         coordinates = {
@@ -88,37 +89,28 @@ class TestPURLGenerator:
         purl = generator.generate_purl(coordinates, 0.9)
         assert purl == "pkg:cargo/serde@1.0.0"
     
-    def test_invalid_url_no_purl(self, generator):
+    @pytest.mark.parametrize("url", [
+        'https://github.com/owner/repo/pull/123',  # Pull request
+        'https://github.com/owner/repo/issues/456',  # Issue
+        'https://github.com/owner/repo/wiki/Page',  # Wiki
+        'not-a-url',  # Invalid URL
+        '',  # Empty URL
+    ])
+    def test_invalid_url_no_purl(self, generator, url):
         """Test that invalid URLs don't generate PURLs."""
-        invalid_urls = [
-            'https://github.com/owner/repo/pull/123',  # Pull request
-            'https://github.com/owner/repo/issues/456',  # Issue
-            'https://github.com/owner/repo/wiki/Page',  # Wiki
-            'not-a-url',  # Invalid URL
-            '',  # Empty URL
-        ]
-        
-        for url in invalid_urls:
-            coordinates = {
-                'name': 'test',
-                'download_url': url
-            }
-            purl = generator.generate_purl(coordinates, 0.9)
-            assert purl is None
-    
-    def test_missing_required_fields(self, generator):
-        """Test handling of missing required fields."""
-        # Missing name
         coordinates = {
-            'download_url': 'https://github.com/owner/repo'
+            'name': 'test',
+            'download_url': url
         }
         purl = generator.generate_purl(coordinates, 0.9)
         assert purl is None
-        
-        # Missing download_url
-        coordinates = {
-            'name': 'test'
-        }
+    
+    @pytest.mark.parametrize("coordinates", [
+        {'download_url': 'https://github.com/owner/repo'},  # Missing name
+        {'name': 'test'},  # Missing download_url
+    ], ids=["missing-name", "missing-download-url"])
+    def test_missing_required_fields(self, generator, coordinates):
+        """Test handling of missing required fields."""
         purl = generator.generate_purl(coordinates, 0.9)
         assert purl is None
     
@@ -141,4 +133,19 @@ class TestPURLGenerator:
         }
         
         purl = generator.generate_purl(coordinates, 0.9)
-        assert purl is None
\ No newline at end of file
+        assert purl is None
+    
+    def test_purl_caching_is_hit(self, generator):
+        """Test that repeated coordinates reuse the cached PURL."""
+        coordinates = {
+            'name': 'test-repo',
+            'version': '1.0.0',
+            'download_url': 'https://github.com/owner/test-repo'
+        }
+        
+        first = generator.generate_purl(coordinates, 0.9)
+        hits = _generate_purl_cached.cache_info().hits
+        second = generator.generate_purl(dict(coordinates), 0.95)
+        
+        assert first == second == "pkg:github/owner/test-repo@1.0.0"
+        assert _generate_purl_cached.cache_info().hits == hits + 1
@@ -1,9 +1,7 @@
 """Unit tests for the directory scanner module."""
 
-import asyncio
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -12,185 +10,236 @@ from src2id.core.config import SWHPIConfig
 from src2id.core.swhid import SWHIDGenerator
 
 
+# Directory layouts shared by the scanner tests; each is built once per session
+SCANNER_TREES = {
+    "empty": {},
+    "files": {
+        "file1.txt": "content1",
+        "file2.py": "import os\n",
+        "README.md": "# Test",
+    },
+    "nested": {
+        "setup.py": "setup()",
+        "src/__init__.py": "",
+        "src/core/main.py": "def main(): pass",
+    },
+    "deep": {
+        "file0.py": "root",
+        "level1/file1.py": "level1",
+        "level1/level2/file2.py": "level2",
+        "level1/level2/level3/file3.py": "level3",
+    },
+    "hidden": {
+        ".git/config": "git config",
+        "src/main.py": "print('hello')",
+        "setup.py": "setup()",
+    },
+    "binary": {
+        "binary.bin": b"\x00\x01\x02\x03",
+        "text.txt": "hello",
+    },
+    "modules": {f"file{i}.py": f"value = {i}" for i in range(5)},
+}
+
+# Content SWHIDs of the "files" tree, as computed by `git hash-object`
+FILES_TREE_SWHIDS = {
+    "file1.txt": "swh:1:cnt:dd954e7a4e1a62ff90c5a0709dce5928716535c1",
+    "file2.py": "swh:1:cnt:21b405d8c2dac873e9063b1dff87e46c3876aa58",
+    "README.md": "swh:1:cnt:21e60f8358c6175f2efbbe34808a4d99d12d18ee",
+}
+
+
+@pytest.fixture(scope="session")
+def scanner_trees(tmp_path_factory, materialize_tree):
+    """Build every scanner test layout once; tests must treat them as read-only."""
+    return {
+        name: materialize_tree(tmp_path_factory.mktemp(f"scanner-{name}"), files)
+        for name, files in SCANNER_TREES.items()
+    }
+
+
+@pytest.fixture(scope="class")
+def config():
+    """Create test configuration."""
+    return SWHPIConfig(max_depth=2, verbose=False)
+
+
+@pytest.fixture(scope="class")
+def scanner(config, swhid_gen):
+    """Create scanner instance."""
+    return DirectoryScanner(config, swhid_gen)
+
+
 class TestDirectoryScanner:
     """Test suite for DirectoryScanner class."""
     
-    @pytest.fixture
-    def config(self):
-        """Create test configuration."""
-        return SWHPIConfig(max_depth=2, verbose=False)
-    
-    @pytest.fixture
-    def scanner(self, config):
-        """Create scanner instance."""
-        swhid_gen = SWHIDGenerator()
-        return DirectoryScanner(config, swhid_gen)
-    
     def test_scanner_initialization(self, scanner, config):
         """Test scanner is properly initialized."""
         assert scanner.config == config
         assert isinstance(scanner.swhid_generator, SWHIDGenerator)
     
-    def test_scan_empty_directory(self, scanner):
+    def test_scan_empty_directory(self, scanner, scanner_trees):
         """Test scanning an empty directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Empty directory might not be considered meaningful
-            # Implementation only adds meaningful directories
-            assert isinstance(dir_candidates, list)
-            assert isinstance(file_candidates, list)
-            assert len(file_candidates) == 0
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["empty"])
+        
+        # Empty directory might not be considered meaningful
+        # Implementation only adds meaningful directories
+        assert isinstance(dir_candidates, list)
+        assert isinstance(file_candidates, list)
+        assert len(file_candidates) == 0
     
-    def test_scan_with_files(self, scanner):
+    def test_scan_with_files(self, scanner, scanner_trees):
         """Test scanning directory with files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create some test files with meaningful extensions
-            (path / "file1.txt").write_text("content1")
-            (path / "file2.py").write_text("import os\n")
-            (path / "README.md").write_text("# Test")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Directory with files should be meaningful
-            assert len(dir_candidates) >= 1
-            assert len(file_candidates) >= 2  # At least our files
-            
-            # Check file candidates
-            file_names = {fc.path.name for fc in file_candidates}
-            assert "file1.txt" in file_names or "file2.py" in file_names
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["files"])
+        
+        # Directory with files should be meaningful
+        assert len(dir_candidates) >= 1
+        assert len(file_candidates) >= 2  # At least our files
+        
+        # Check file candidates
+        file_names = {fc.path.name for fc in file_candidates}
+        assert "file1.txt" in file_names or "file2.py" in file_names
     
-    def test_scan_nested_directories(self, scanner):
+    def test_scan_nested_directories(self, scanner, scanner_trees):
         """Test scanning nested directory structure."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create nested structure with meaningful files
-            subdir1 = path / "src"
-            subdir1.mkdir()
-            subdir2 = subdir1 / "core"
-            subdir2.mkdir()
-            
-            (path / "setup.py").write_text("setup()")
-            (subdir1 / "__init__.py").write_text("")
-            (subdir2 / "main.py").write_text("def main(): pass")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Should have multiple directories
-            assert len(dir_candidates) >= 1
-            assert len(file_candidates) >= 1
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["nested"])
+        
+        # Should have multiple directories
+        assert len(dir_candidates) >= 1
+        assert len(file_candidates) >= 1
     
-    def test_max_depth_respected(self, scanner):
+    def test_max_depth_respected(self, scanner, scanner_trees, monkeypatch):
         """Test that max_depth configuration is respected."""
-        scanner.config.max_depth = 1
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create structure deeper than max_depth
-            subdir1 = path / "level1"
-            subdir1.mkdir()
-            subdir2 = subdir1 / "level2"
-            subdir2.mkdir()
-            subdir3 = subdir2 / "level3"
-            subdir3.mkdir()
-            
-            # Add files to make directories meaningful
-            (path / "file0.py").write_text("root")
-            (subdir1 / "file1.py").write_text("level1")
-            (subdir2 / "file2.py").write_text("level2")
-            (subdir3 / "file3.py").write_text("level3")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Check depth of candidates
-            max_depth_found = max((dc.depth for dc in dir_candidates), default=0)
-            assert max_depth_found <= scanner.config.max_depth
+        monkeypatch.setattr(scanner.config, "max_depth", 1)
+        
+        # The layout is deeper than max_depth
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["deep"])
+        
+        # Check depth of candidates
+        max_depth_found = max((dc.depth for dc in dir_candidates), default=0)
+        assert max_depth_found <= scanner.config.max_depth
     
-    def test_skip_hidden_directories(self, scanner):
+    def test_skip_hidden_directories(self, scanner, scanner_trees):
         """Test that hidden directories are skipped."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create hidden directory
-            hidden = path / ".git"
-            hidden.mkdir()
-            (hidden / "config").write_text("git config")
-            
-            # Create normal directory with meaningful content
-            normal = path / "src"
-            normal.mkdir()
-            (normal / "main.py").write_text("print('hello')")
-            (path / "setup.py").write_text("setup()")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Hidden directory should be skipped
-            dir_paths = [dc.path for dc in dir_candidates]
-            assert not any(".git" in str(p) for p in dir_paths)
-            
-            # Files from hidden directories should not be included
-            file_paths = [fc.path for fc in file_candidates]
-            assert not any(".git" in str(p) for p in file_paths)
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["hidden"])
+        
+        # Hidden directory should be skipped
+        dir_paths = [dc.path for dc in dir_candidates]
+        assert not any(".git" in str(p) for p in dir_paths)
+        
+        # Files from hidden directories should not be included
+        file_paths = [fc.path for fc in file_candidates]
+        assert not any(".git" in str(p) for p in file_paths)
     
-    def test_skip_binary_files(self, scanner):
+    def test_skip_binary_files(self, scanner, scanner_trees):
         """Test that binary files are handled correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create a binary file
-            (path / "binary.bin").write_bytes(b'\x00\x01\x02\x03')
-            
-            # Create a text file
-            (path / "text.txt").write_text("hello")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Both files should be included (binary filtering happens at SWHID level)
-            assert len(file_candidates) == 2
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["binary"])
+        
+        # Both files should be included (binary filtering happens at SWHID level)
+        assert len(file_candidates) == 2
     
-    def test_no_duplicate_paths(self, scanner):
+    def test_no_duplicate_paths(self, scanner, scanner_trees):
         """Test that same scan returns consistent results."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create some files
-            (path / "file1.py").write_text("test")
-            (path / "README.md").write_text("# Test")
-            
-            # Scan twice (scanner doesn't track visited paths across calls)
-            dir_candidates1, file_candidates1 = scanner.scan_recursive(path)
-            dir_candidates2, file_candidates2 = scanner.scan_recursive(path)
-            
-            # Should return same results
-            assert len(dir_candidates1) == len(dir_candidates2)
-            assert len(file_candidates1) == len(file_candidates2)
+        path = scanner_trees["files"]
+        
+        # Scan twice (scanner doesn't track visited paths across calls)
+        dir_candidates1, file_candidates1 = scanner.scan_recursive(path)
+        dir_candidates2, file_candidates2 = scanner.scan_recursive(path)
+        
+        # Should return same results
+        assert len(dir_candidates1) == len(dir_candidates2)
+        assert len(file_candidates1) == len(file_candidates2)
+    
+    def test_rescan_sees_nested_changes(self, config, swhid_gen, write_tree):
+        """Test that rescanning picks up edits below the root directory."""
+        path = write_tree({
+            "src/a.py": "print('hello')\n",
+            "src/b.py": "x = 1\n",
+            "main.py": "import src\n",
+        })
+        scanner = DirectoryScanner(config, swhid_gen)
+        root_mtime = path.stat().st_mtime_ns
+        
+        dirs1, files1 = scanner.scan_recursive(path)
+        
+        # Edit a nested file in place and add a sibling; the root is untouched
+        (path / "src" / "a.py").write_text("print('changed')\n")
+        (path / "src" / "new.py").write_text("y = 2\n")
+        assert path.stat().st_mtime_ns == root_mtime
+        
+        dirs2, files2 = scanner.scan_recursive(path)
+        
+        assert len(files2) == len(files1) + 1
+        old = {fc.path.name: fc.swhid for fc in files1}
+        new = {fc.path.name: fc.swhid for fc in files2}
+        assert new["a.py"] != old["a.py"]
+        assert new["b.py"] == old["b.py"]
+        assert dirs1 and {dc.swhid for dc in dirs2}.isdisjoint(dc.swhid for dc in dirs1)
+        assert (dirs2, files2) == DirectoryScanner(config, swhid_gen).scan_recursive(path)
     
-    def test_swhid_generation(self, scanner):
+    def test_threaded_walk_matches_serial_walk(self, scanner, scanner_trees):
+        """Test that prefetching listings on a thread pool keeps the walk order."""
+        path = scanner_trees["deep"].resolve()
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(scanner._walk(path, executor))
+        
+        assert threaded == list(scanner._walk(path))
+        assert max(depth for _, _, depth, _ in threaded) == scanner.config.max_depth
+    
+    def test_symlink_loop_walked_once(self, scanner, write_tree):
+        """Test that a directory reached again through a symlink is skipped."""
+        root = write_tree({"pkg/main.c": "int main(void) { return 0; }"})
+        os.symlink("..", root / "pkg" / "loop")
+        
+        files = [path for is_dir, path, _, _ in scanner._walk(root.resolve()) if not is_dir]
+        
+        assert [path.name for path in files] == ["main.c"]
+    
+    def test_swhid_generation(self, scanner, scanner_trees):
         """Test that SWHIDs are generated for candidates."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            (path / "test.txt").write_text("test content")
-            
-            dir_candidates, file_candidates = scanner.scan_recursive(path)
-            
-            # Check SWHIDs are generated
-            assert all(dc.swhid.startswith("swh:1:dir:") for dc in dir_candidates)
-            assert all(fc.swhid.startswith("swh:1:cnt:") for fc in file_candidates)
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["files"])
+        
+        # Check SWHIDs are generated
+        assert all(dc.swhid.startswith("swh:1:dir:") for dc in dir_candidates)
+        assert {fc.path.name: fc.swhid for fc in file_candidates} == FILES_TREE_SWHIDS
+    
+    def test_scan_recursive_iter_batches(self, scanner, scanner_trees):
+        """Test that iterative scanning yields the same candidates in batches."""
+        path = scanner_trees["modules"]
+        
+        batches = list(scanner.scan_recursive_iter(path, batch_size=2))
+        dir_candidates, file_candidates = scanner.scan_recursive(path)
+        
+        assert all(len(d) + len(f) <= 2 for d, f in batches)
+        assert sorted(fc.swhid for _, f in batches for fc in f) == sorted(
+            fc.swhid for fc in file_candidates
+        )
+        assert sum(len(d) for d, _ in batches) == len(dir_candidates)
     
-    def test_error_handling_permission_denied(self, scanner):
+    def test_scan_recursive_batches(self, scanner, scanner_trees):
+        """Test that batched scanning matches scan_recursive column by column."""
+        path = scanner_trees["files"]
+        
+        dir_batch, file_batch = scanner.scan_recursive_batches(path)
+        dir_candidates, file_candidates = scanner.scan_recursive(path)
+        
+        assert dir_batch.swhids == [dc.swhid for dc in dir_candidates]
+        assert file_batch.swhids == [fc.swhid for fc in file_candidates]
+        assert file_batch.paths == [fc.path for fc in file_candidates]
+        assert list(file_batch.sizes) == [fc.size for fc in file_candidates]
+        assert list(file_batch.mtimes) == [fc.path.stat().st_mtime_ns for fc in file_candidates]
+        assert len(file_batch) == len(file_candidates)
+    
+    def test_error_handling_permission_denied(self, config, swhid_gen, scanner_trees, monkeypatch):
         """Test handling of permission errors."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Mock a permission error
-            with patch('pathlib.Path.iterdir', side_effect=PermissionError("Access denied")):
-                dir_candidates, file_candidates = scanner.scan_recursive(path)
-                
-                # Should handle error gracefully
-                assert isinstance(dir_candidates, list)
-                assert isinstance(file_candidates, list)
\ No newline at end of file
+        def deny(path):
+            raise PermissionError("Access denied")
+        
+        scanner = DirectoryScanner(config, swhid_gen)
+        monkeypatch.setattr(scanner, "_list_dir", deny)
+        dir_candidates, file_candidates = scanner.scan_recursive(scanner_trees["files"])
+        
+        # Should handle error gracefully and skip the unreadable directory
+        assert dir_candidates == []
+        assert file_candidates == []
@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime, timedelta
 
 from src2id.core.config import SWHPIConfig
-from src2id.core.scorer import ConfidenceScorer
+from src2id.core.scorer import ConfidenceScorer, MatchRecord
 from src2id.core.models import MatchType
 
 
@@ -136,4 +136,52 @@ class TestConfidenceScorer:
         }
         
         score = scorer.calculate_confidence(match_data)
-        assert 0.0 <= score <= 1.0  # Should handle None gracefully
\ No newline at end of file
+        assert 0.0 <= score <= 1.0  # Should handle None gracefully
+    
+    def test_repeated_matches_reuse_cached_score(self, scorer):
+        """Test that matches with the same scoring inputs share one computation."""
+        match_data = {
+            'match_type': MatchType.EXACT,
+            'frequency_rank': 7,
+            'is_official_org': True,
+            'last_activity': datetime.now() - timedelta(days=45)
+        }
+        
+        first = scorer.calculate_confidence(match_data)
+        hits = ConfidenceScorer._combine_scores.cache_info().hits
+        second = scorer.calculate_confidence({**match_data, 'is_official_org': 1})
+        
+        assert second == first
+        assert ConfidenceScorer._combine_scores.cache_info().hits == hits + 1
+    
+    def test_score_batch_matches_individual_scores(self, scorer):
+        """Test that batch scoring agrees with scoring matches one by one."""
+        now = datetime.now()
+        matches = [
+            {'match_type': MatchType.EXACT, 'frequency_rank': 3, 'last_activity': now},
+            {'match_type': MatchType.FUZZY, 'similarity_score': 0.7,
+             'last_activity': (now - timedelta(days=400)).isoformat()},
+            {'match_type': MatchType.EXACT, 'is_official_org': True, 'last_activity': None},
+        ]
+        
+        assert scorer.score_batch(matches) == [
+            scorer.calculate_confidence(match_data) for match_data in matches
+        ]
+        assert scorer.score_batch([]) == []
+    
+    def test_match_record_scores_like_dict(self, scorer):
+        """Test that a MatchRecord scores the same as the equivalent dictionary."""
+        match_data = {
+            'match_type': MatchType.FUZZY,
+            'similarity_score': 0.7,
+            'frequency_rank': 12,
+            'is_official_org': True,
+            'last_activity': datetime.now() - timedelta(days=100)
+        }
+        record = MatchRecord(**match_data)
+        
+        assert MatchRecord.from_dict(match_data) == record
+        assert scorer.calculate_confidence(record) == scorer.calculate_confidence(match_data)
+        assert scorer.score_batch([record, match_data]) == [
+            scorer.calculate_confidence(match_data)
+        ] * 2
@@ -1,12 +1,14 @@
 """Unit tests for search strategies."""
 
+import asyncio
+import inspect
+import json
 from pathlib import Path
-from unittest.mock import Mock, patch
-import tempfile
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from src2id.search.strategies import SourceIdentifier
+from src2id.search.strategies import SourceIdentifier, _first_of_each
 from src2id.search.providers import SearchProviderRegistry
 
 
@@ -24,49 +26,28 @@ class TestSourceIdentifier:
         assert identifier.swh_client is None  # Lazy initialization
         assert identifier.search_registry is not None
         assert identifier.hash_searcher is not None
+        assert identifier.hash_searcher.search_registry is identifier.search_registry
         assert identifier.verbose is False
     
-    def test_identify_method_exists(self, identifier):
-        """Test that identify method exists."""
-        assert hasattr(identifier, 'identify')
-        assert hasattr(identifier, '_identify_via_hash_search')
-        assert hasattr(identifier, '_identify_via_web_search')
-        assert hasattr(identifier, '_identify_via_scanoss')
-        assert hasattr(identifier, '_identify_via_swh')
-    
-    def test_search_registry_exists(self, identifier):
-        """Test that search registry exists."""
-        assert identifier.search_registry is not None
-        assert hasattr(identifier.search_registry, 'get_provider')
-        assert hasattr(identifier.search_registry, 'close_all')
-    
-    def test_hash_searcher_exists(self, identifier):
-        """Test that hash searcher exists."""
-        assert identifier.hash_searcher is not None
-        assert hasattr(identifier.hash_searcher, 'search_file')
-    
-    def test_swh_client_lazy_init(self, identifier):
-        """Test that SWH client is lazily initialized."""
-        # Initially no SWH client
-        assert identifier.swh_client is None
-        
-        # Has method for SWH identification
-        assert hasattr(identifier, '_identify_via_swh')
-    
-    def test_identifier_strategies_config(self, identifier):
-        """Test identifier strategies configuration."""
-        # Test default strategies exist
-        available_strategies = {
-            "hash_search": identifier._identify_via_hash_search,
-            "web_search": identifier._identify_via_web_search,
-            "scanoss": identifier._identify_via_scanoss,
-            "swh": identifier._identify_via_swh
-        }
+    @pytest.mark.parametrize("owner, name, is_coro", [
+        (None, "identify", True),
+        (None, "_identify_via_metadata", True),
+        (None, "_identify_via_hash_search", True),
+        (None, "_identify_via_web_search", True),
+        (None, "_identify_via_scanoss", True),
+        (None, "_identify_via_swh", True),
+        (None, "print_results", False),
+        ("search_registry", "get_provider", False),
+        ("search_registry", "close_all", True),
+        ("hash_searcher", "search_file", True),
+    ])
+    def test_identifier_interface(self, identifier, owner, name, is_coro):
+        """Test the methods the CLI and strategies rely on."""
+        target = getattr(identifier, owner) if owner else identifier
+        method = getattr(target, name)
         
-        # All strategies should have methods
-        for strategy_name, method in available_strategies.items():
-            assert method is not None
-            assert callable(method)
+        assert callable(method)
+        assert inspect.iscoroutinefunction(method) is is_coro
     
     def test_identifier_verbose_mode(self, identifier):
         """Test identifier verbose mode."""
@@ -78,10 +59,7 @@ class TestSourceIdentifier:
         assert verbose_identifier.verbose is True
     
     def test_print_results_method(self, identifier):
-        """Test that print_results method exists."""
-        assert hasattr(identifier, 'print_results')
-        
-        # Test it can handle a mock result
+        """Test that print_results handles a result dictionary."""
         mock_results = {
             "path": "/test/path",
             "identified": True,
@@ -103,12 +81,264 @@ class TestSourceIdentifier:
         # Default order should be optimized for performance
         identifier = SourceIdentifier(verbose=False)
         
-        # The default order is: hash_search, web_search, scanoss
+        # The default order is: metadata, hash_search, web_search, scanoss
         # SWH is only added if use_swh=True
         assert identifier.swh_client is None  # Not initialized by default
     
-    def test_cleanup_method(self, identifier):
-        """Test that cleanup methods exist."""
-        # Should have registry for cleanup
-        assert identifier.search_registry is not None
-        assert hasattr(identifier.search_registry, 'close_all')
\ No newline at end of file
+    def test_metadata_short_circuit(self, identifier, write_tree):
+        """Test that complete package metadata skips the other strategies."""
+        path = write_tree({
+            "package.json": json.dumps({
+                "name": "left-pad",
+                "version": "1.3.0",
+                "author": "azer",
+                "homepage": "https://github.com/left-pad/left-pad#readme",
+                "repository": {
+                    "type": "git",
+                    "url": "git+https://github.com/left-pad/left-pad.git"
+                }
+            }),
+            "index.js": "module.exports = leftPad;",
+        })
+        
+        with patch.object(identifier, '_identify_via_hash_search') as hash_search:
+            results = asyncio.run(identifier.identify(path))
+        
+        hash_search.assert_not_called()
+        assert results["identified"] is True
+        assert results["strategies_used"] == ["metadata"]
+        assert results["final_origin"] == "https://github.com/left-pad/left-pad"
+        assert results["confidence"] == 0.9
+    
+    def test_network_strategies_run_concurrently(self, identifier, tmp_path):
+        """Test that strategies after metadata are awaited concurrently."""
+        async def run():
+            web_search_started = asyncio.Event()
+            
+            async def hash_search(path, max_depth):
+                # Only completes if web_search starts while this is waiting
+                await asyncio.wait_for(web_search_started.wait(), timeout=1)
+                return [{"origin": "https://github.com/owner/repo", "confidence": 0.6}]
+            
+            async def web_search(path, max_depth):
+                web_search_started.set()
+                return [{"origin": "https://github.com/owner/repo", "confidence": 0.8}]
+            
+            with patch.object(identifier, '_identify_via_hash_search', hash_search), \
+                 patch.object(identifier, '_identify_via_web_search', web_search):
+                return await identifier.gather_candidates(
+                    tmp_path, strategies=["metadata", "hash_search", "web_search"]
+                )
+        
+        gathered = asyncio.run(run())
+        
+        assert gathered["strategies_used"] == ["hash_search", "web_search"]
+        assert [c["confidence"] for c in gathered["candidates"]] == [0.6, 0.8]
+    
+    def test_conclusive_strategy_cancels_the_rest(self, identifier, tmp_path):
+        """Test that a candidate above the threshold stops slower strategies."""
+        cancelled = []
+        
+        async def hash_search(path, max_depth):
+            return [{"origin": "https://github.com/owner/repo", "confidence": 0.9}]
+        
+        async def web_search(path, max_depth):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append("web_search")
+                raise
+            return []
+        
+        with patch.object(identifier, '_identify_via_hash_search', hash_search), \
+             patch.object(identifier, '_identify_via_web_search', web_search):
+            results = asyncio.run(identifier.identify(
+                tmp_path, strategies=["hash_search", "web_search"]
+            ))
+        
+        assert cancelled == ["web_search"]
+        assert results["strategies_used"] == ["hash_search"]
+        assert results["final_origin"] == "https://github.com/owner/repo"
+    
+    def test_web_search_hit_does_not_cancel_the_rest(self, identifier, tmp_path):
+        """Test that a fixed-confidence web search hit never stops a slower strategy."""
+        async def hash_search(path, max_depth):
+            await asyncio.sleep(0.01)
+            return [{"origin": "https://github.com/owner/repo", "confidence": 0.8}]
+        
+        async def web_search(path, max_depth):
+            return [{"origin": "https://github.com/other/repo", "confidence": 0.6}]
+        
+        with patch.object(identifier, '_identify_via_hash_search', hash_search), \
+             patch.object(identifier, '_identify_via_web_search', web_search):
+            gathered = asyncio.run(identifier.gather_candidates(
+                tmp_path, strategies=["hash_search", "web_search"], stop_threshold=0.5
+            ))
+        
+        assert gathered["strategies_used"] == ["hash_search", "web_search"]
+    
+    def test_borderline_candidate_does_not_stop(self, identifier, tmp_path):
+        """Test that only candidates clearing the threshold by a margin stop early."""
+        hash_search = AsyncMock(return_value=[
+            {"origin": "https://github.com/owner/repo", "confidence": 0.8}
+        ])
+        
+        async def scanoss(path, max_depth):
+            await asyncio.sleep(0.01)
+            return [{"origin": "https://github.com/owner/repo", "confidence": 0.9}]
+        
+        with patch.object(identifier, '_identify_via_hash_search', hash_search), \
+             patch.object(identifier, '_identify_via_scanoss', scanoss):
+            gathered = asyncio.run(identifier.gather_candidates(
+                tmp_path, strategies=["hash_search", "scanoss"], stop_threshold=0.75
+            ))
+        
+        assert gathered["strategies_used"] == ["hash_search", "scanoss"]
+    
+    def test_exhaustive_runs_every_strategy(self, identifier, tmp_path):
+        """Test that exhaustive identification ignores conclusive matches."""
+        hash_search = AsyncMock(return_value=[
+            {"origin": "https://github.com/owner/repo", "confidence": 0.9}
+        ])
+        web_search = AsyncMock(return_value=[
+            {"origin": "https://github.com/owner/repo", "confidence": 0.7}
+        ])
+        
+        with patch.object(identifier, '_identify_via_hash_search', hash_search), \
+             patch.object(identifier, '_identify_via_web_search', web_search):
+            results = asyncio.run(identifier.identify(
+                tmp_path, strategies=["hash_search", "web_search"], exhaustive=True
+            ))
+        
+        web_search.assert_awaited_once()
+        assert results["strategies_used"] == ["hash_search", "web_search"]
+        assert results["confidence"] == pytest.approx(0.8)
+    
+    @pytest.mark.parametrize("manifest, expected", [
+        pytest.param({}, 0.3, id="name"),
+        pytest.param({"version": "1.3.0"}, 0.5, id="version"),
+        pytest.param({"version": "1.3.0", "author": "azer"}, 0.7, id="author"),
+        pytest.param(
+            {"version": "1.3.0", "author": {"name": "azer"},
+             "homepage": "https://github.com/left-pad/left-pad#readme"},
+            0.9, id="homepage"
+        ),
+    ])
+    def test_metadata_confidence_scale(self, identifier, write_tree, manifest, expected):
+        """Test that confidence grows with how completely the manifest is filled in."""
+        path = write_tree({"package.json": json.dumps({
+            "name": "left-pad",
+            "repository": "https://github.com/left-pad/left-pad",
+            **manifest,
+        })})
+        
+        candidates = asyncio.run(identifier._identify_via_metadata(path, 1))
+        
+        assert candidates[0]["origin"] == "https://github.com/left-pad/left-pad"
+        assert candidates[0]["confidence"] == expected
+    
+    @pytest.mark.parametrize("manifest", [
+        pytest.param({"name": "left-pad", "version": "1.3.0"}, id="registry-fallback"),
+        pytest.param(
+            {"name": "left-pad", "version": "1.3.0", "homepage": "https://left-pad.io"},
+            id="homepage-off-git-host"
+        ),
+    ])
+    def test_metadata_without_repository_is_not_an_origin(self, identifier, write_tree, manifest):
+        """Test that manifests without a declared repository yield no origin."""
+        path = write_tree({"package.json": json.dumps(manifest)})
+        
+        candidates = asyncio.run(identifier._identify_via_metadata(path, 1))
+        
+        assert candidates == []
+    
+    def test_metadata_without_repository_runs_other_strategies(self, identifier, write_tree):
+        """Test that a name and version alone do not skip the other strategies."""
+        path = write_tree({
+            "package.json": json.dumps({"name": "left-pad", "version": "1.3.0"}),
+        })
+        
+        async def hash_search(path, max_depth):
+            return [{"origin": "https://github.com/left-pad/left-pad", "confidence": 0.8}]
+        
+        with patch.object(identifier, '_identify_via_hash_search', hash_search):
+            gathered = asyncio.run(identifier.gather_candidates(
+                path, strategies=["metadata", "hash_search"], stop_threshold=0.5
+            ))
+        
+        assert gathered["strategies_used"] == ["hash_search"]
+        assert gathered["candidates"][0]["origin"] == "https://github.com/left-pad/left-pad"
+    
+    def test_first_of_each(self, write_tree):
+        """Test sampling files by suffix in a single walk."""
+        path = write_tree({
+            "src/a.c": "int x;",
+            "src/b.c": "int x;",
+            "src/c.c": "int x;",
+            "src/lib/d.c": "int y;",
+            "README.md": "# readme",
+            "notes.txt": "notes",
+        })
+        
+        samples = _first_of_each(path, {'.c': 2, '.md': 1, '.h': 1})
+        
+        assert len(samples['.c']) == 2
+        assert all(p.suffix == '.c' for p in samples['.c'])
+        assert samples['.md'] == [path / "README.md"]
+        assert samples['.h'] == []
+    
+    def test_apply_threshold_reuses_candidates(self):
+        """Test that one gathered candidate set can be filtered at several thresholds."""
+        gathered = {
+            "path": "/test/path",
+            "strategies_used": ["hash_search", "web_search"],
+            "candidates": [
+                {"origin": "https://github.com/test/repo", "confidence": 0.8},
+                {"origin": "https://github.com/test/repo", "confidence": 0.6},
+                {"origin": "https://github.com/other/repo", "confidence": 0.5},
+            ]
+        }
+        
+        result_low = SourceIdentifier.apply_threshold(gathered, 0.1)
+        result_high = SourceIdentifier.apply_threshold(gathered, 0.8)
+        
+        assert result_low["identified"] is True
+        assert result_low["final_origin"] == "https://github.com/test/repo"
+        assert result_low["confidence"] == pytest.approx(0.7)
+        assert result_high["identified"] is False
+        assert result_high["final_origin"] is None
+        assert result_high["strategies_used"] == ["hash_search", "web_search"]
+    
+    def test_identify_via_swh_scans_off_loop(self, identifier, write_tree):
+        """Test that SWH identification checks the SWHIDs of the scanned tree."""
+        path = write_tree({f"src/module{i}.py": f"value = {i}" for i in range(3)})
+        
+        swh_client = Mock()
+        swh_client.check_swhids_known = AsyncMock(return_value={})
+        identifier.swh_client = swh_client
+        
+        candidates = asyncio.run(identifier._identify_via_swh(path, 2))
+        
+        assert candidates == []
+        checked = swh_client.check_swhids_known.call_args[0][0]
+        assert sum(s.startswith("swh:1:cnt:") for s in checked) == 3
+        assert any(s.startswith("swh:1:dir:") for s in checked)
+    
+    def test_identify_via_swh_checks_directories_first(self, identifier, write_tree):
+        """Test that every directory is kept when truncating to 100 SWHIDs."""
+        path = write_tree({
+            f"pkg{d}/module{i}.py": f"value = {d * 3 + i}"
+            for d in range(40) for i in range(3)
+        })
+        
+        swh_client = Mock()
+        swh_client.check_swhids_known = AsyncMock(return_value={})
+        identifier.swh_client = swh_client
+        
+        asyncio.run(identifier._identify_via_swh(path, 2))
+        
+        checked = swh_client.check_swhids_known.call_args[0][0]
+        assert len(checked) == 100
+        # The root and its 40 packages, ahead of any file
+        assert all(s.startswith("swh:1:dir:") for s in checked[:41])
+        assert not any(s.startswith("swh:1:dir:") for s in checked[41:])
@@ -0,0 +1,74 @@
+"""Unit tests for the subcomponent detector module."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src2id.core.subcomponent_detector import SubcomponentDetector, identify_subcomponents
+
+
+class TestSubcomponentDetector:
+    """Test suite for SubcomponentDetector class."""
+    
+    @pytest.fixture
+    def detector(self):
+        """Create detector instance."""
+        return SubcomponentDetector(verbose=False)
+    
+    def test_check_markers(self, detector, tmp_path):
+        """Test that markers are reported in PACKAGE_MARKERS order."""
+        (tmp_path / "setup.py").write_text("")
+        (tmp_path / "package.json").write_text("{}")
+        (tmp_path / "README.md").write_text("")
+        
+        assert detector._check_markers(tmp_path) == ["package.json", "setup.py"]
+        assert detector._check_markers(tmp_path / "missing") == []
+    
+    def test_detect_monorepo_subcomponents(self, detector, write_tree):
+        """Test detection of packages inside a monorepo."""
+        root = write_tree({
+            "package.json": '{"name": "root"}',
+            "lerna.json": "{}",
+            "packages/web/package.json": "",
+            "packages/api/setup.py": "",
+            # Skipped directories are never treated as components
+            "node_modules/dep/package.json": "{}",
+        })
+        
+        components = detector.detect_subcomponents(root)
+        
+        by_name = {c.name: c for c in components}
+        assert set(by_name) == {root.name, "web", "api"}
+        assert by_name["web"].type == "npm"
+        assert by_name["api"].type == "python"
+        assert components[0].path == root
+    
+    def test_failed_identification_cancels_the_rest(self, write_tree):
+        """Test that one failing component does not leave the others running."""
+        root = write_tree({
+            "package.json": '{"name": "root"}',
+            "lerna.json": "{}",
+            "packages/web/package.json": "",
+            "packages/api/setup.py": "",
+        })
+        cancelled = []
+        
+        async def identify_source(path, **kwargs):
+            if path.name == "web":
+                raise RuntimeError("identification failed")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(path.name)
+                raise
+        
+        async def run():
+            with patch("src2id.search.identify_source", identify_source):
+                with pytest.raises(RuntimeError):
+                    await identify_subcomponents(root)
+            # Every other identification was cancelled before returning
+            return {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+        
+        assert asyncio.run(run()) == set()
+        assert sorted(cancelled) == sorted([root.name, "api"])
@@ -1,131 +1,242 @@
 """Tests for SWHID generation."""
 
+import hashlib
 import pytest
-import tempfile
 import os
-from pathlib import Path
+import threading
+from unittest.mock import patch
 
 from src2id.core.swhid import SWHIDGenerator
 
+# Two files and a subdirectory
+BASE_TREE = {
+    "file1.txt": "Hello World",
+    "file2.py": "print('test')",
+    "subdir/file3.txt": "Nested content",
+}
+
+
+@pytest.fixture(scope="module")
+def base_tree(tmp_path_factory, materialize_tree):
+    """Create the test files once, for tests that only read them."""
+    return materialize_tree(tmp_path_factory.mktemp("swhid_base"), BASE_TREE)
+
 
 class TestSWHIDGenerator:
     """Test SWHID generation functionality."""
     
     @pytest.fixture
-    def generator(self):
-        """Create a SWHID generator instance."""
-        # Use fallback implementation for testing
-        return SWHIDGenerator(use_swh_model=False)
+    def temp_dir(self, write_tree):
+        """Create a temporary directory with test files that a test may modify."""
+        return write_tree(BASE_TREE)
     
-    @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory with test files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir)
-            
-            # Create some test files
-            (path / "file1.txt").write_text("Hello World")
-            (path / "file2.py").write_text("print('test')")
-            
-            # Create a subdirectory
-            subdir = path / "subdir"
-            subdir.mkdir()
-            (subdir / "file3.txt").write_text("Nested content")
-            
-            yield path
-    
-    def test_generate_directory_swhid(self, generator, temp_dir):
+    def test_generate_directory_swhid(self, fallback_swhid_gen, base_tree):
         """Test generating SWHID for a directory."""
-        swhid = generator.generate_directory_swhid(temp_dir)
+        swhid = fallback_swhid_gen.generate_directory_swhid(base_tree)
         
         assert swhid.startswith("swh:1:dir:")
         parts = swhid.split(":")
         assert len(parts) == 4
         assert len(parts[3]) == 40  # SHA1 hash length
     
-    def test_generate_content_swhid(self, generator, temp_dir):
+    def test_generate_content_swhid(self, fallback_swhid_gen, base_tree):
         """Test generating SWHID for file content."""
-        file_path = temp_dir / "file1.txt"
-        swhid = generator.generate_content_swhid(file_path)
+        file_path = base_tree / "file1.txt"
+        swhid = fallback_swhid_gen.generate_content_swhid(file_path)
         
         assert swhid.startswith("swh:1:cnt:")
         parts = swhid.split(":")
         assert len(parts) == 4
         assert len(parts[3]) == 40  # SHA1 hash length
     
-    def test_consistent_directory_hash(self, generator, temp_dir):
+    def test_consistent_directory_hash(self, fallback_swhid_gen, base_tree):
         """Test that directory hash is consistent."""
-        swhid1 = generator.generate_directory_swhid(temp_dir)
-        swhid2 = generator.generate_directory_swhid(temp_dir)
+        swhid1 = fallback_swhid_gen.generate_directory_swhid(base_tree)
+        swhid2 = fallback_swhid_gen.generate_directory_swhid(base_tree)
         
         assert swhid1 == swhid2
     
-    def test_consistent_content_hash(self, generator, temp_dir):
+    def test_consistent_content_hash(self, fallback_swhid_gen, base_tree):
         """Test that content hash is consistent."""
-        file_path = temp_dir / "file1.txt"
-        swhid1 = generator.generate_content_swhid(file_path)
-        swhid2 = generator.generate_content_swhid(file_path)
+        file_path = base_tree / "file1.txt"
+        swhid1 = fallback_swhid_gen.generate_content_swhid(file_path)
+        swhid2 = fallback_swhid_gen.generate_content_swhid(file_path)
         
         assert swhid1 == swhid2
     
-    def test_different_content_different_hash(self, generator, temp_dir):
+    def test_different_content_different_hash(self, fallback_swhid_gen, base_tree):
         """Test that different content produces different hashes."""
-        file1 = temp_dir / "file1.txt"
-        file2 = temp_dir / "file2.py"
+        file1 = base_tree / "file1.txt"
+        file2 = base_tree / "file2.py"
         
-        swhid1 = generator.generate_content_swhid(file1)
-        swhid2 = generator.generate_content_swhid(file2)
+        swhid1 = fallback_swhid_gen.generate_content_swhid(file1)
+        swhid2 = fallback_swhid_gen.generate_content_swhid(file2)
         
         assert swhid1 != swhid2
     
-    def test_validate_swhid_valid(self, generator):
-        """Test validating correct SWHID format."""
-        valid_swhids = [
-            "swh:1:dir:0000000000000000000000000000000000000000",
-            "swh:1:cnt:abcdef1234567890abcdef1234567890abcdef12",
-            "swh:1:rev:1234567890abcdef1234567890abcdef12345678",
-        ]
+    def test_parallel_directory_hash_matches_serial(self, fallback_swhid_gen, base_tree):
+        """Test that hashing files on the thread pool gives the same SWHID."""
+        serial = fallback_swhid_gen.generate_directory_swhid(base_tree)
+        
+        with patch("src2id.core.swhid.PARALLEL_HASH_MIN_FILES", 1):
+            assert fallback_swhid_gen.generate_directory_swhid(base_tree) == serial
         
-        for swhid in valid_swhids:
-            assert generator.validate_swhid(swhid) is True
+        # Feeding the entry buffer to the hasher after every file
+        with patch("src2id.core.swhid.HASH_BUFFER_SIZE", 1):
+            assert fallback_swhid_gen.generate_directory_swhid(base_tree) == serial
     
-    def test_validate_swhid_invalid(self, generator):
+    def test_generators_share_one_hash_pool(self, base_tree):
+        """Test that each new generator does not start its own hashing threads."""
+        def hash_threads():
+            return {t for t in threading.enumerate() if t.name.startswith("swhid-hash")}
+        
+        with patch("src2id.core.swhid.PARALLEL_HASH_MIN_FILES", 1):
+            SWHIDGenerator(use_swh_model=False).generate_directory_swhid(base_tree)
+            threads = hash_threads()
+            SWHIDGenerator(use_swh_model=False).generate_directory_swhid(base_tree)
+        
+        assert threads and hash_threads() <= threads
+    
+    def test_directory_hash_reuses_file_digests(self, fallback_swhid_gen, temp_dir):
+        """Test that files already hashed for a directory are not read again."""
+        parent_swhid = fallback_swhid_gen.generate_directory_swhid(temp_dir)
+        
+        with patch("src2id.core.swhid._sha1_of_file") as sha1_of_file:
+            subdir_swhid = fallback_swhid_gen.generate_directory_swhid(temp_dir / "subdir")
+            sha1_of_file.assert_not_called()
+        
+        # Rehashing from scratch gives the same results
+        fresh = SWHIDGenerator(use_swh_model=False)
+        assert fresh.generate_directory_swhid(temp_dir) == parent_swhid
+        assert fresh.generate_directory_swhid(temp_dir / "subdir") == subdir_swhid
+        
+        # A modified file is read again
+        (temp_dir / "subdir" / "file3.txt").write_text("Changed content")
+        assert fallback_swhid_gen.generate_directory_swhid(temp_dir / "subdir") != subdir_swhid
+    
+    @pytest.mark.parametrize("swhid", [
+        "swh:1:dir:0000000000000000000000000000000000000000",
+        "swh:1:cnt:abcdef1234567890abcdef1234567890abcdef12",
+        "swh:1:rev:1234567890abcdef1234567890abcdef12345678",
+    ])
+    def test_validate_swhid_valid(self, fallback_swhid_gen, swhid):
+        """Test validating correct SWHID format."""
+        assert fallback_swhid_gen.validate_swhid(swhid) is True
+    
+    @pytest.mark.parametrize("swhid", [
+        pytest.param("not:a:swhid", id="not-a-swhid"),
+        pytest.param("swh:2:dir:abc", id="wrong-version"),
+        pytest.param("swh:1:xyz:abc", id="invalid-type"),
+        pytest.param("swh:1:dir:xyz", id="hash-not-hex"),
+        pytest.param("swh:1:dir:abc", id="hash-too-short"),
+        pytest.param("swh:1:dir:-000000000000000000000000000000000000000", id="hash-with-sign"),
+        pytest.param("swh:1:dir:0000000000000000000000000000000000000000\n", id="trailing-newline"),
+        pytest.param("swh:1:dir", id="missing-hash"),
+        pytest.param("", id="empty-string"),
+        pytest.param(None, id="none"),
+    ])
+    def test_validate_swhid_invalid(self, fallback_swhid_gen, swhid):
         """Test validating incorrect SWHID format."""
-        invalid_swhids = [
-            "not:a:swhid",
-            "swh:2:dir:abc",  # Wrong version
-            "swh:1:xyz:abc",  # Invalid type
-            "swh:1:dir:xyz",  # Invalid hash (not hex)
-            "swh:1:dir:abc",  # Too short hash
-            "swh:1:dir",  # Missing hash
-            "",  # Empty string
-            None,  # None
-        ]
-        
-        for swhid in invalid_swhids:
-            assert generator.validate_swhid(swhid) is False
-    
-    def test_error_on_non_directory(self, generator, temp_dir):
+        assert fallback_swhid_gen.validate_swhid(swhid) is False
+    
+    def test_error_on_non_directory(self, fallback_swhid_gen, base_tree):
         """Test error when path is not a directory."""
-        file_path = temp_dir / "file1.txt"
+        file_path = base_tree / "file1.txt"
         
         with pytest.raises(ValueError, match="is not a directory"):
-            generator.generate_directory_swhid(file_path)
+            fallback_swhid_gen.generate_directory_swhid(file_path)
     
-    def test_error_on_non_file(self, generator, temp_dir):
+    def test_error_on_non_file(self, fallback_swhid_gen, base_tree):
         """Test error when path is not a file."""
         with pytest.raises(ValueError, match="Not a file"):
-            generator.generate_content_swhid(temp_dir)
+            fallback_swhid_gen.generate_content_swhid(base_tree)
     
-    def test_hidden_files_ignored(self, generator, temp_dir):
+    def test_hidden_files_ignored(self, fallback_swhid_gen, temp_dir):
         """Test that hidden files are ignored in directory hash."""
         # Get initial hash
-        swhid1 = generator.generate_directory_swhid(temp_dir)
+        swhid1 = fallback_swhid_gen.generate_directory_swhid(temp_dir)
         
         # Add a hidden file
         (temp_dir / ".hidden").write_text("Hidden content")
         
         # Hash should be the same (hidden file ignored)
-        swhid2 = generator.generate_directory_swhid(temp_dir)
+        swhid2 = fallback_swhid_gen.generate_directory_swhid(temp_dir)
+        
+        assert swhid1 == swhid2
+    
+    @pytest.mark.parametrize("patches", [
+        pytest.param({}, id="small-file"),
+        pytest.param({"SMALL_FILE_THRESHOLD": 0}, id="file-digest"),
+        pytest.param({"SMALL_FILE_THRESHOLD": 0, "MMAP_THRESHOLD": 1}, id="mmap"),
+        pytest.param({"SMALL_FILE_THRESHOLD": 0, "_file_digest": None}, id="plain-read"),
+    ])
+    def test_content_swhid_matches_git_blob(
+        self, fallback_swhid_gen, tmp_path, monkeypatch, patches
+    ):
+        """Test that content SWHIDs match git blob hashes on every read path."""
+        for name, value in patches.items():
+            monkeypatch.setattr(f"src2id.core.swhid.{name}", value)
+        
+        content = b"x" * 4096
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(content)
+        expected = hashlib.sha1(b"blob 4096\0" + content).hexdigest()
+        
+        assert fallback_swhid_gen.generate_content_swhid(file_path) == f"swh:1:cnt:{expected}"
+    
+    def test_empty_file_swhid(self, fallback_swhid_gen, tmp_path):
+        """Test that empty files hash to the empty git blob."""
+        file_path = tmp_path / "empty.txt"
+        file_path.write_bytes(b"")
+        
+        swhid = fallback_swhid_gen.generate_content_swhid(file_path)
+        
+        assert swhid == "swh:1:cnt:e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+    
+    def test_content_swhid_cached_per_inode(self, fallback_swhid_gen, temp_dir):
+        """Test that hardlinked files are hashed once until modified."""
+        file_path = temp_dir / "file1.txt"
+        link_path = temp_dir / "link.txt"
+        os.link(file_path, link_path)
+        
+        swhid = fallback_swhid_gen.generate_content_swhid(file_path)
+        with patch.object(fallback_swhid_gen, "_hash_file_content") as hash_file:
+            assert fallback_swhid_gen.generate_content_swhid(link_path) == swhid
+            hash_file.assert_not_called()
+        
+        st = file_path.stat()
+        file_path.write_text("Hello There")
+        os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        assert fallback_swhid_gen.generate_content_swhid(link_path) != swhid
+    
+    def test_symlink_hashed_as_its_target_path(self, fallback_swhid_gen, temp_dir):
+        """Test that a symlink hashes like a git symlink blob, not as its target."""
+        file_path = temp_dir / "file1.txt"
+        link_path = temp_dir / "link.txt"
+        link_path.symlink_to(file_path.name)
+        
+        target_swhid = fallback_swhid_gen.generate_content_swhid(file_path)
+        # What git hash-object gives for a symlink: a blob of the target path
+        expected = "swh:1:cnt:" + hashlib.sha1(b"blob 9\0file1.txt").hexdigest()
+        
+        assert fallback_swhid_gen.generate_content_swhid(link_path) == expected
+        assert fallback_swhid_gen.generate_content_swhid(link_path, os.lstat(link_path)) == expected
+        assert expected != target_swhid
+    
+    def test_file_caches_are_bounded(self, tmp_path):
+        """Test that the per-file caches keep only their most recent entries."""
+        paths = [tmp_path / f"file{i}.txt" for i in range(3)]
+        for i, path in enumerate(paths):
+            path.write_text(f"content {i}")
+        
+        with patch("src2id.core.swhid.FILE_CACHE_SIZE", 2):
+            generator = SWHIDGenerator(use_swh_model=False)
+        for path in paths:
+            generator.generate_content_swhid(path)
         
-        assert swhid1 == swhid2
\ No newline at end of file
+        with patch.object(generator, "_hash_file_content") as hash_file:
+            generator.generate_content_swhid(paths[-1])
+            hash_file.assert_not_called()
+            # The oldest entry was evicted
+            generator.generate_content_swhid(paths[0])
+            assert hash_file.call_count == 1